@@ -1,14 +1,24 @@
 import json
+import logging
 import tkinter as tk
 from PIL import Image, ImageGrab, ImageTk
-import time
+import numpy as np
 from typing import Optional, Tuple, TYPE_CHECKING
 
+try:
+    from mss import mss
+except ImportError:  # mss is optional; fall back to PIL.ImageGrab
+    mss = None
+
 if TYPE_CHECKING:
     from control_window import ControlWindow
 
 from config import ZOOM_FACTOR, ZOOM_AREA_SIZE, ZOOM_DISPLAY_SIZE, SCREENSHOT_DELAY
 
+_ZOOM_DISPLAY_HALF = ZOOM_DISPLAY_SIZE // 2
+
+logger = logging.getLogger(__name__)
+
 class CalibrationWindow(tk.Toplevel):
     """
     A modal fullscreen window for calibrating single chunk positioning.
@@ -22,17 +32,18 @@ class CalibrationWindow(tk.Toplevel):
         self.preview_rect = None
         self.zoom_view_items = {}
         self.image_refs = {}
+        self._motion_after_id = None
+        self._last_motion_event = None
+        self._motion_bind_id = None
         
-        # Take screenshot
-        self.screenshot = self._capture_screenshot()
-        
-        self._setup_window()
-        self._create_canvas()
-        self._bind_events()
+        # Hide the windows now and take the screenshot once the event loop has
+        # had time to repaint the desktop behind them
+        self._begin_capture()
+        self._capture_after_id = self.after(int(SCREENSHOT_DELAY * 1000), self._finish_capture)
         
-    def _capture_screenshot(self):
-        """Captures a screenshot of the entire screen."""
-        # Hide master windows to take a clean screenshot
+    def _begin_capture(self):
+        """Hides this and the master windows ahead of the screenshot."""
+        self.withdraw()
         self.master.withdraw()
         
         # Type-safe access to image_window attribute
@@ -42,8 +53,20 @@ class CalibrationWindow(tk.Toplevel):
                 image_window.withdraw()
         
         self.master.update_idletasks()
-        time.sleep(SCREENSHOT_DELAY)
-        screenshot = ImageGrab.grab()
+
+    def _finish_capture(self):
+        """Captures the screen, restores the master windows and builds the UI."""
+        self._capture_after_id = None
+        # Take screenshot; zoom sampling works on a NumPy copy of its pixels,
+        # padded with black so every zoom tile is an in-bounds slice
+        self.screenshot = self._grab_screen()
+        self._pad = ZOOM_AREA_SIZE // 2
+        self._arr = np.pad(
+            np.asarray(self.screenshot),
+            ((self._pad, self._pad), (self._pad, self._pad), (0, 0))
+        )
+        # Window size until the fullscreen geometry is mapped and cached
+        self._W, self._H = self.screenshot.size
         
         # Restore master windows immediately
         self.master.deiconify()
@@ -57,7 +80,30 @@ class CalibrationWindow(tk.Toplevel):
                 self.master.single_chunk_var.get()):
                 image_window.deiconify()
                 
-        return screenshot
+        self.deiconify()
+        self._setup_window()
+        self._create_canvas()
+        self._bind_events()
+
+    def _grab_screen(self):
+        """Grabs the primary screen, preferring mss over PIL.ImageGrab."""
+        if mss is not None:
+            try:
+                # The grabber lives on the master so repeated calibrations reuse it
+                if getattr(self.master, '_sct', None) is None:
+                    self.master._sct = mss()
+                sct = self.master._sct
+                # monitors[0] spans every monitor; the fullscreen window and the
+                # ImageGrab fallback only cover the primary one at monitors[1]
+                shot = sct.grab(sct.monitors[1])
+                # Decoding BGRX -> RGB produces a new image, so the grab buffer
+                # is free to be reused by the next capture without a .copy()
+                return Image.frombuffer('RGB', shot.size, memoryview(shot.bgra), 'raw', 'BGRX', 0, 1)
+            except Exception as e:
+                logger.warning("mss capture failed, falling back to ImageGrab: %s", e)
+        # ImageGrab can return RGBA on some platforms; the zoom view only needs RGB
+        screenshot = ImageGrab.grab()
+        return screenshot.convert('RGB') if screenshot.mode != 'RGB' else screenshot
     
     def _setup_window(self):
         """Configures the fullscreen modal window."""
@@ -65,6 +111,15 @@ class CalibrationWindow(tk.Toplevel):
         self.attributes('-topmost', True)
         self.overrideredirect(True)
         self.grab_set()  # Make the window modal
+        self.after(0, self._cache_geom)
+
+    def _cache_geom(self):
+        """Caches the fullscreen window size, which stays fixed once mapped."""
+        width, height = self.winfo_width(), self.winfo_height()
+        if width <= 1 or height <= 1:
+            # Not mapped yet (Tk reports 1x1); a fullscreen window covers the screen
+            width, height = self.winfo_screenwidth(), self.winfo_screenheight()
+        self._W, self._H = width, height
         
     def _create_canvas(self):
         """Creates the canvas for displaying the screenshot and zoom view."""
@@ -74,65 +129,70 @@ class CalibrationWindow(tk.Toplevel):
         # Display the screenshot
         self.image_refs['screenshot'] = ImageTk.PhotoImage(self.screenshot)
         self.canvas.create_image(0, 0, image=self.image_refs['screenshot'], anchor='nw')
+        # Tk now holds the pixels for display and self._arr holds them for zoom
+        # sampling, so release the PIL copy rather than keep a third buffer alive
+        self.screenshot = None
+
+        # Zoom view items are created once (hidden) and only moved/repainted on motion
+        self.image_refs['zoom'] = ImageTk.PhotoImage('RGB', (ZOOM_DISPLAY_SIZE, ZOOM_DISPLAY_SIZE))
+        self.zoom_view_items['image'] = self.canvas.create_image(
+            0, 0, image=self.image_refs['zoom'], anchor='nw', state='hidden', tags='zoom'
+        )
+        self.zoom_view_items['box'] = self.canvas.create_rectangle(
+            0, 0, ZOOM_DISPLAY_SIZE, ZOOM_DISPLAY_SIZE,
+            outline='cyan', width=2, state='hidden', tags='zoom'
+        )
+        self.zoom_view_items['cross_v'] = self.canvas.create_line(
+            0, 0, 0, ZOOM_DISPLAY_SIZE, fill='red', width=1, state='hidden', tags='zoom'
+        )
+        self.zoom_view_items['cross_h'] = self.canvas.create_line(
+            0, 0, ZOOM_DISPLAY_SIZE, 0, fill='red', width=1, state='hidden', tags='zoom'
+        )
         
     def _bind_events(self):
         """Binds mouse and keyboard events."""
-        self.canvas.bind("<Motion>", self._on_motion)
+        if self._motion_bind_id is None:  # Never install the motion handler twice
+            self._motion_bind_id = self.canvas.bind("<Motion>", self._on_motion)
         self.canvas.bind("<Button-1>", self._on_left_click)
         self.bind("<Escape>", self._on_cancel)
         
     def _update_zoom_view(self, event):
         """Updates the zoom view at the mouse position."""
-        # Clear previous zoom view
-        for item in self.zoom_view_items.values():
-            self.canvas.delete(item)
-        self.zoom_view_items.clear()
-        
         # Calculate zoom view position
         view_x, view_y = event.x + 30, event.y + 30
-        if view_x + ZOOM_DISPLAY_SIZE > self.winfo_width():
+        if view_x + ZOOM_DISPLAY_SIZE > self._W:
             view_x = event.x - ZOOM_DISPLAY_SIZE - 30
-        if view_y + ZOOM_DISPLAY_SIZE > self.winfo_height():
+        if view_y + ZOOM_DISPLAY_SIZE > self._H:
             view_y = event.y - ZOOM_DISPLAY_SIZE - 30
             
-        # Create zoomed image
-        crop_box = (
-            event.x - ZOOM_AREA_SIZE // 2,
-            event.y - ZOOM_AREA_SIZE // 2,
-            event.x + ZOOM_AREA_SIZE // 2,
-            event.y + ZOOM_AREA_SIZE // 2
-        )
-        zoomed_img = self.screenshot.crop(crop_box).resize(
-            (ZOOM_DISPLAY_SIZE, ZOOM_DISPLAY_SIZE), 
-            Image.Resampling.NEAREST
-        )
+        # Slice the zoom area straight out of the padded screenshot array; the pad
+        # is half the zoom area, so the tile centred on the cursor starts at (x, y)
+        x0, y0 = event.x, event.y
+        tile = self._arr[y0:y0 + ZOOM_AREA_SIZE, x0:x0 + ZOOM_AREA_SIZE]
+        # Integer nearest-neighbour upscale
+        zoomed = tile.repeat(ZOOM_FACTOR, axis=0).repeat(ZOOM_FACTOR, axis=1)
         
-        # Display zoom view
-        self.image_refs['zoom'] = ImageTk.PhotoImage(zoomed_img)
-        self.zoom_view_items['image'] = self.canvas.create_image(
-            view_x, view_y, image=self.image_refs['zoom'], anchor='nw'
-        )
-        self.zoom_view_items['box'] = self.canvas.create_rectangle(
-            view_x, view_y, 
-            view_x + ZOOM_DISPLAY_SIZE, view_y + ZOOM_DISPLAY_SIZE, 
-            outline='cyan', width=2
+        # Repaint the existing photo image and move the items into place
+        self.image_refs['zoom'].paste(Image.fromarray(zoomed))
+        items = self.zoom_view_items
+        self.canvas.coords(items['image'], view_x, view_y)
+        self.canvas.coords(
+            items['box'],
+            view_x, view_y,
+            view_x + ZOOM_DISPLAY_SIZE, view_y + ZOOM_DISPLAY_SIZE
         )
         
-        # Draw crosshairs
-        center_x, center_y = view_x + ZOOM_DISPLAY_SIZE // 2, view_y + ZOOM_DISPLAY_SIZE // 2
-        self.zoom_view_items['cross_v'] = self.canvas.create_line(
-            center_x, view_y, center_x, view_y + ZOOM_DISPLAY_SIZE, 
-            fill='red', width=1
-        )
-        self.zoom_view_items['cross_h'] = self.canvas.create_line(
-            view_x, center_y, view_x + ZOOM_DISPLAY_SIZE, center_y, 
-            fill='red', width=1
-        )
+        # Position crosshairs
+        center_x, center_y = view_x + _ZOOM_DISPLAY_HALF, view_y + _ZOOM_DISPLAY_HALF
+        self.canvas.coords(items['cross_v'], center_x, view_y, center_x, view_y + ZOOM_DISPLAY_SIZE)
+        self.canvas.coords(items['cross_h'], view_x, center_y, view_x + ZOOM_DISPLAY_SIZE, center_y)
+        self.canvas.itemconfigure('zoom', state='normal')
         
     def _draw_crosshair(self, x, y, size=10, color='cyan'):
         """Draws a crosshair at the specified position."""
         self.canvas.create_line(x - size, y, x + size, y, fill=color, width=2)
         self.canvas.create_line(x, y - size, x, y + size, fill=color, width=2)
+        self.canvas.tag_raise('zoom')
         
     def _update_preview_rect(self, x2, y2):
         """Updates the preview rectangle between two points."""
@@ -146,9 +206,20 @@ class CalibrationWindow(tk.Toplevel):
             self.preview_rect = self.canvas.create_rectangle(
                 x1, y1, x2, y2, outline='red', width=2
             )
+            self.canvas.tag_raise('zoom')
             
     def _on_motion(self, event):
-        """Handles mouse motion events."""
+        """Handles mouse motion events, coalescing bursts to ~60 Hz."""
+        self._last_motion_event = event
+        if self._motion_after_id is None:
+            self._motion_after_id = self.after(16, self._flush_motion)
+
+    def _flush_motion(self):
+        """Applies the most recent motion event to the zoom view and preview."""
+        self._motion_after_id = None
+        event = self._last_motion_event
+        if event is None:
+            return
         self._update_zoom_view(event)
         if len(self.click_points) == 1:
             self._update_preview_rect(
@@ -172,6 +243,7 @@ class CalibrationWindow(tk.Toplevel):
                 self.result = (x_min, y_min, width, height)
                 self._save_calibration_data()
             
+            self._stop_motion_tracking()
             self.destroy()
             
     def _save_calibration_data(self):
@@ -186,4 +258,26 @@ class CalibrationWindow(tk.Toplevel):
             
     def _on_cancel(self, event):
         """Handles the escape key to cancel calibration."""
-        self.destroy() 
\ No newline at end of file
+        self._stop_motion_tracking()
+        self.destroy()
+
+    def _stop_motion_tracking(self):
+        """Unbinds motion and cancels a scheduled update so neither fires during teardown."""
+        if self._motion_bind_id is not None:
+            self.canvas.unbind("<Motion>", self._motion_bind_id)
+            self._motion_bind_id = None
+        if self._motion_after_id is not None:
+            self.after_cancel(self._motion_after_id)
+            self._motion_after_id = None
+
+    def destroy(self):
+        """Destroys the window and drops its Tk photo images right away."""
+        # The caller keeps this object alive to read `result`, so release the
+        # full-screen photo and zoom buffers here instead of waiting for GC
+        if self._capture_after_id is not None:
+            # Destroyed during the screenshot delay; the capture must not run
+            self.after_cancel(self._capture_after_id)
+            self._capture_after_id = None
+        super().destroy()
+        self.image_refs.clear()
+        self._arr = None
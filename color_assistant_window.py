@@ -1,10 +1,10 @@
+import os
 import tkinter as tk
 import ttkbootstrap as ttk
 from tkinter import messagebox
-from typing import List, Tuple, Optional, TYPE_CHECKING
-from collections import defaultdict
-
-from collections import defaultdict
+from typing import List, Set, Tuple, Optional, TYPE_CHECKING
+from functools import lru_cache
+from concurrent.futures import Future, ThreadPoolExecutor
 
 # Import our new, improved function
 from image_utils import extract_color_groups
@@ -13,6 +13,11 @@ from ttkbootstrap.scrolled import ScrolledFrame
 if TYPE_CHECKING:
     from control_window import ControlWindow
 
+@lru_cache(maxsize=32)
+def _compute_groups(image_path: str, mtime: float, eps: float, fast_lab: bool) -> dict:
+    """Memoized color grouping; `mtime` invalidates entries when the file changes."""
+    return extract_color_groups(image_path, eps=eps, fast_lab=fast_lab)
+
 class ColorAssistantWindow(tk.Toplevel):
     """
     A window to display common colors, now with controls to find and filter them.
@@ -24,19 +29,30 @@ class ColorAssistantWindow(tk.Toplevel):
         self.image_path = image_path
         self.was_confirmed = False # Flag to check if "Apply" was clicked
         self.selected_colors: List[Tuple[int, int, int]] = []
+        self._selected_set: Set[Tuple[int, int, int]] = set()  # Mirrors selected_colors for O(1) lookups
         self.colors: List[Tuple[int, int, int]] = []
         self.swatches = {}
         self.pane_to_container_map = {}
+        self._pane_colors = {}  # Colors of panes whose swatches haven't been built yet
+        self._swatch_pool: List[tk.Canvas] = []
+        self._hex = {}  # Color tuple -> Tk '#rrggbb' string for the current groups
+
+        # Color grouping runs on a worker so the Tk loop stays responsive
+        self._exec = ThreadPoolExecutor(max_workers=1)
+        self._pending_groups: Optional[Future] = None
+        self._status_label: Optional[ttk.Label] = None
 
         # --- Use passed-in settings with .get() for safety ---
         self.automated_mode = tk.BooleanVar(value=settings.get('automated_mode', False))
         self.drawing_speed = tk.DoubleVar(value=settings.get('drawing_speed', 0.05))
         self.color_tolerance = tk.IntVar(value=settings.get('color_tolerance', 10))
         self.grouping_sensitivity = tk.DoubleVar(value=settings.get('grouping_sensitivity', 10.0))
+        self.fast_grouping = tk.BooleanVar(value=settings.get('fast_grouping', False))
         self.double_click = tk.BooleanVar(value=settings.get('double_click', False))
 
         self._setup_window()
         self._create_widgets()
+        self.bind("<Destroy>", self._on_destroy, add="+")
         self.after(50, self._update_color_swatches)
 
     def _setup_window(self):
@@ -75,6 +91,12 @@ class ColorAssistantWindow(tk.Toplevel):
         helper_label = ttk.Label(find_frame, text="← Less Groups  |  More Groups →", font=("Segoe UI", 7))
         helper_label.pack(fill=tk.X, pady=(0, 5), padx=5)
 
+        # OkLab skips the CIELAB conversion; groups can come out slightly different
+        ttk.Checkbutton(
+            find_frame, text="Fast Grouping (approximate)", variable=self.fast_grouping,
+            command=self._update_color_swatches
+        ).pack(anchor=tk.W, pady=2)
+
         ttk.Button(
             find_frame, text="Refresh Colors", command=self._update_color_swatches, style="info.TButton"
         ).pack(pady=5)
@@ -137,20 +159,68 @@ class ColorAssistantWindow(tk.Toplevel):
             
     def _update_color_swatches(self):
         """Finds and groups colors using DBSCAN and updates the UI."""
-        for widget in self.color_frame.winfo_children():
-            widget.destroy()
+        # Return swatches to the pool before tearing down the panes
+        for swatch in self.swatches.values():
+            swatch.pack_forget()
+            self._swatch_pool.append(swatch)
         self.swatches.clear()
+        for pane in self.pane_to_container_map:
+            pane.destroy()
         self.pane_to_container_map.clear()
+        self._pane_colors.clear()
+
+        if self._status_label is None:
+            self._status_label = ttk.Label(self.color_frame, text="Computing…")
+            self._status_label.pack(pady=10)
+
+        # Replace any computation still waiting for the worker
+        if self._pending_groups is not None:
+            self._pending_groups.cancel()
 
         try:
             # Call our new, improved function with the sensitivity parameter
             sensitivity = self.grouping_sensitivity.get()
-            grouped_colors = extract_color_groups(self.image_path, eps=sensitivity)
+            future = self._exec.submit(
+                _compute_groups, self.image_path, os.path.getmtime(self.image_path), sensitivity,
+                self.fast_grouping.get()
+            )
         except Exception as e:
+            self._clear_status()
             messagebox.showerror("Error", f"Could not extract colors: {e}")
             return
 
-        # The rest of the function is the same as before, as it just displays the groups
+        self._pending_groups = future
+        self.after(50, lambda: self._poll_groups(future))
+
+    def _poll_groups(self, future: Future):
+        """Waits for a grouping job and builds the panes once it completes."""
+        if future is not self._pending_groups or not self.winfo_exists():
+            return  # Superseded by a newer refresh, or the window is gone
+        if not future.done():
+            self.after(50, lambda: self._poll_groups(future))
+            return
+
+        self._pending_groups = None
+        self._clear_status()
+        try:
+            grouped_colors = future.result()
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not extract colors: {e}")
+            return
+        self._populate_groups(grouped_colors)
+
+    def _clear_status(self):
+        """Removes the "Computing…" placeholder."""
+        if self._status_label is not None:
+            self._status_label.destroy()
+            self._status_label = None
+
+    def _populate_groups(self, grouped_colors: dict):
+        """Builds a collapsible pane per color group."""
+        self._hex = {c: '#%02x%02x%02x' % c for group in grouped_colors.values() for c in group}
+
+        # Only the pane headers are built here; swatches are created when a pane is expanded
+        first_pane = None
         for group_name, colors_in_group in sorted(grouped_colors.items()):
             if not colors_in_group:
                 continue
@@ -161,7 +231,7 @@ class ColorAssistantWindow(tk.Toplevel):
             header_frame = ttk.Frame(pane)
             header_frame.pack(fill=tk.X)
 
-            btn_toggle = ttk.Button(header_frame, text=f"▼ {group_name} ({len(colors_in_group)})", style="Link.TButton")
+            btn_toggle = ttk.Button(header_frame, text=f"► {group_name} ({len(colors_in_group)})", style="Link.TButton")
             btn_toggle.pack(side=tk.LEFT)
             btn_toggle.config(command=lambda p=pane, b=btn_toggle: self._toggle_pane(p, b))
 
@@ -171,28 +241,50 @@ class ColorAssistantWindow(tk.Toplevel):
             )
             btn_select_all.pack(side=tk.RIGHT)
 
-            swatch_container = ttk.Frame(pane)
-            swatch_container.pack(fill=tk.X, padx=10, pady=5)
-            self.pane_to_container_map[pane] = swatch_container
-
-            max_swatches_per_row = 5
-            for i, color in enumerate(colors_in_group):
-                row = i // max_swatches_per_row
-                col = i % max_swatches_per_row
-
-                if col == 0:
-                    row_frame = ttk.Frame(swatch_container)
-                    row_frame.pack(fill=tk.X, pady=2)
-
-                rgb_hex = f"#{color[0]:02x}{color[1]:02x}{color[2]:02x}"
-                swatch = tk.Canvas(
-                    row_frame, width=40, height=30, cursor="hand2",
-                    highlightthickness=2, highlightbackground="#4f4f4f"
-                )
-                swatch.pack(side=tk.LEFT, padx=5)
-                swatch.create_rectangle(0, 0, 40, 30, fill=rgb_hex, outline="")
-                swatch.bind("<Button-1>", lambda e, c=color: self._on_color_select(c))
-                self.swatches[color] = swatch
+            self.pane_to_container_map[pane] = ttk.Frame(pane)
+            self._pane_colors[pane] = colors_in_group
+            if first_pane is None:
+                first_pane = (pane, btn_toggle)
+
+        # Open the first group so the list isn't empty on load
+        if first_pane:
+            self._toggle_pane(*first_pane)
+
+    def _build_swatches(self, container: ttk.Frame, colors_in_group: List[Tuple[int, int, int]]):
+        """Fills a pane's container with swatches, reusing pooled canvases."""
+        max_swatches_per_row = 5
+        for i, color in enumerate(colors_in_group):
+            if i % max_swatches_per_row == 0:
+                row_frame = ttk.Frame(container)
+                row_frame.pack(fill=tk.X, pady=2)
+
+            swatch = self._acquire_swatch()
+            swatch.itemconfigure("fill", fill=self._hex[color])
+            swatch.config(highlightbackground="cyan" if color in self._selected_set else "#4f4f4f")
+            swatch.color = color  # Read by the click handler bound when it was created
+            # Pooled swatches are children of color_frame, so pack them into the row
+            # and raise them above the (newer) pane frames
+            swatch.pack(in_=row_frame, side=tk.LEFT, padx=5)
+            swatch.lift()
+            self.swatches[color] = swatch
+
+    def _acquire_swatch(self) -> tk.Canvas:
+        """Returns a swatch canvas from the pool, creating one if the pool is empty."""
+        if self._swatch_pool:
+            return self._swatch_pool.pop()
+        swatch = tk.Canvas(
+            self.color_frame, width=40, height=30, cursor="hand2",
+            highlightthickness=2, highlightbackground="#4f4f4f"
+        )
+        swatch.create_rectangle(0, 0, 40, 30, outline="", tags="fill")
+        # Bound once per canvas; reuse only changes the color it reports, so
+        # refreshes don't pile up a new Tcl command per bind
+        swatch.bind("<Button-1>", self._on_swatch_click)
+        return swatch
+
+    def _on_swatch_click(self, event):
+        """Toggles the color of the clicked swatch."""
+        self._on_color_select(event.widget.color)
 
     def _toggle_pane(self, pane: ttk.Frame, button: ttk.Button):
         """Shows or hides the swatch container within a pane."""
@@ -200,6 +292,9 @@ class ColorAssistantWindow(tk.Toplevel):
         if not container:
             return
 
+        if pane in self._pane_colors:
+            self._build_swatches(container, self._pane_colors.pop(pane))
+
         # button = pane.winfo_children()[0].winfo_children()[0] # Yuck, but effective
         
         if container.winfo_viewable():
@@ -212,34 +307,48 @@ class ColorAssistantWindow(tk.Toplevel):
     def _toggle_group_selection(self, colors_in_group: List[Tuple[int, int, int]]):
         """Selects or deselects all colors in a given group."""
         # Check if any color in the group is already selected
-        is_any_selected = any(c in self.selected_colors for c in colors_in_group)
+        is_any_selected = not self._selected_set.isdisjoint(colors_in_group)
 
         if is_any_selected:
             # If any are selected, deselect the entire group
             for color in colors_in_group:
-                if color in self.selected_colors:
+                if color in self._selected_set:
                     self._on_color_select(color) # This will toggle it off
         else:
             # If none are selected, select the entire group
             for color in colors_in_group:
-                if color not in self.selected_colors:
+                if color not in self._selected_set:
                     self._on_color_select(color) # This will toggle it on
 
     def _on_color_select(self, color: Tuple[int, int, int]):
         """Handles toggling color selection and provides visual feedback."""
+        # Swatches of collapsed panes may not exist yet; they pick up the state when built
         swatch = self.swatches.get(color)
-        if not swatch: return
 
-        if color in self.selected_colors:
+        if color in self._selected_set:
+            self._selected_set.discard(color)
             self.selected_colors.remove(color)
-            swatch.config(highlightbackground="#4f4f4f")
+            if swatch:
+                swatch.config(highlightbackground="#4f4f4f")
         else:
+            self._selected_set.add(color)
             self.selected_colors.append(color)
-            swatch.config(highlightbackground="cyan")
+            if swatch:
+                swatch.config(highlightbackground="cyan")
 
         num_selected = len(self.selected_colors)
         self.selected_color_label.config(text=f"Selected: {num_selected} color{'s' if num_selected != 1 else ''}")
 
+    def _on_destroy(self, event):
+        """Stops the grouping worker when the window closes."""
+        if event.widget is self:
+            # Only the latest job can still be queued; cancel it by hand, since
+            # shutdown's cancel_futures needs Python 3.9
+            if self._pending_groups is not None:
+                self._pending_groups.cancel()
+            self._pending_groups = None
+            self._exec.shutdown(wait=False)
+
     def _confirm_selection(self):
         """Confirms the selection and closes the window."""
         if self.automated_mode.get() and not self.selected_colors:
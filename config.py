@@ -1,3 +1,5 @@
+from types import MappingProxyType
+
 # Image processing configuration
 CHUNK_SIZE = 32
 
@@ -21,8 +23,13 @@ SUCCESS_COLOR = "green"
 DEFAULT_WINDOW_X = 200
 DEFAULT_WINDOW_Y = 200
 
-# Hotkey configuration
-DEFAULT_HOTKEYS = {
+# Memory budget for enlarged chunks the overlay keeps for revisits
+CHUNK_CACHE_BUDGET_BYTES = 256 * 1024 * 1024
+# Memory budget for full-image photos kept for recently used scales (Tk stores 4 bytes a pixel)
+FULL_IMAGE_CACHE_BUDGET_BYTES = 512 * 1024 * 1024
+
+# Hotkey configuration (read-only; ControlWindow works on a copy)
+DEFAULT_HOTKEYS = MappingProxyType({
     'toggle_visibility': 'Insert',
     'next_chunk': 'Right',
     'prev_chunk': 'Left',
@@ -34,22 +41,22 @@ DEFAULT_HOTKEYS = {
     'toggle_single_chunk': 'S',
     'toggle_clickthrough': 'C',
     'stop_drawing': 'F12',
-}
-
-# Method mapping for hotkey actions
-HOTKEY_METHOD_MAP = {
-    'toggle_visibility': 'toggle_image_window_visibility',
-    'next_chunk': 'next_chunk',
-    'prev_chunk': 'prev_chunk',
-    'increase_opacity': 'increase_opacity',
-    'decrease_opacity': 'decrease_opacity',
-    'increase_scale': 'increase_scale',
-    'decrease_scale': 'decrease_scale',
-    'reset_scale': 'reset_scale',
-    'toggle_single_chunk': 'toggle_single_chunk_mode',
-    'toggle_clickthrough': 'toggle_clickthrough_mode',
-    'stop_drawing': 'stop_automated_drawing',
-}
+})
+
+# Method mapping for hotkey actions, as (action, method_name) pairs
+HOTKEY_METHOD_MAP = (
+    ('toggle_visibility', 'toggle_image_window_visibility'),
+    ('next_chunk', 'next_chunk'),
+    ('prev_chunk', 'prev_chunk'),
+    ('increase_opacity', 'increase_opacity'),
+    ('decrease_opacity', 'decrease_opacity'),
+    ('increase_scale', 'increase_scale'),
+    ('decrease_scale', 'decrease_scale'),
+    ('reset_scale', 'reset_scale'),
+    ('toggle_single_chunk', 'toggle_single_chunk_mode'),
+    ('toggle_clickthrough', 'toggle_clickthrough_mode'),
+    ('stop_drawing', 'stop_automated_drawing'),
+)
 
 # Calibration settings
 ZOOM_FACTOR = 8
@@ -57,6 +64,7 @@ ZOOM_AREA_SIZE = 32
 ZOOM_DISPLAY_SIZE = ZOOM_AREA_SIZE * ZOOM_FACTOR
 
 # Threading and polling
-KEY_POLL_INTERVAL = 0.02
-CALIBRATION_SLEEP = 0.05
+HOTKEY_DRAIN_INTERVAL_MS = 10  # How often the Tk thread runs hotkeys queued by the key hook
+UI_DRAIN_INTERVAL_MS = 40  # How often the Tk thread applies GUI updates queued while drawing
+CHUNK_PREWARM_AHEAD = 8  # Chunks past the current one the overlay renders in the background
 SCREENSHOT_DELAY = 0.2 
\ No newline at end of file
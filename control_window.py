@@ -3,23 +3,33 @@ import ttkbootstrap as ttk
 from ttkbootstrap.constants import BOTH, LEFT, RIGHT, NORMAL, DISABLED, HORIZONTAL, W, X, BOTTOM, Y
 from tkinter import filedialog, messagebox
 from PIL import Image, ImageTk, ImageGrab
+import win32api
 import os
 import json
+import logging
+import numpy as np
 import threading
+import queue
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 
 
 from config import (
     CHUNK_SIZE, DEFAULT_ALPHA, DEFAULT_SCALE, CALIBRATED_SCALE,
     HIGHLIGHT_COLOR, DEFAULT_HOTKEYS, MIN_ALPHA, MAX_ALPHA,
-    MIN_SCALE, MAX_SCALE
+    MIN_SCALE, MAX_SCALE, HOTKEY_DRAIN_INTERVAL_MS, UI_DRAIN_INTERVAL_MS, SCREENSHOT_DELAY
 )
 from image_window import ImageWindow
-from win_utils import poll_global_keys
-from calibration_window import CalibrationWindow
-from color_assistant_window import ColorAssistantWindow
-from image_utils import colors_are_similar
-import pyautogui
+from win_utils import poll_global_keys, stop_global_key_polling, draw_stroke
+from image_utils import (
+    colors_within_tolerance, count_existing_chunks, get_chunk_info,
+    split_image_into_chunks, chunks_up_to_date
+)
+
+logger = logging.getLogger(__name__)
+
+IMAGE_FILETYPES = (("Image Files", "*.png *.jpg *.jpeg *.bmp *.gif"), ("All files", "*.*"))
+VERIFY_BATCH_SIZE = 32 # Pixels drawn between verification screenshots
 
 class ControlWindow(ttk.Window):
     """
@@ -39,8 +49,27 @@ class ControlWindow(ttk.Window):
         self.hotkey_map = DEFAULT_HOTKEYS.copy()
         self.stop_polling = False
         self.is_drawing = False
+        self._stop_drawing = threading.Event() # Set to make the drawing thread stop
         self.calibration_rect = None
         self.settings = {} # Add a settings dictionary
+        self._saved_settings = None # Copy of the settings as last read from/written to disk
+        self._sct = None # Shared mss screen grabber, created on first calibration
+        self._debounce_ids = {} # Pending after() ids for debounced slider work, by key
+        self._suppress_slider_cb = False # Set while _set_slider moves a slider programmatically
+        self._slider_values = {} # Last snapped value handled per slider, to drop repeats
+        self._hotkey_info_key = None # hotkey_map snapshot the hotkey info label was built from
+        self._preview_cache = {} # (preview_w, preview_h, mode) -> scaled preview PhotoImage
+        self._preview_fresh = set() # Cache keys whose PhotoImage shows the current image
+        self._preview_mip = None # Pre-shrunk copy of the source the preview is resized from
+        self._preview_geom = None # (grid_xs, grid_ys) chunk grid lines on the drawn preview
+        self._preview_canvas_size = None # Canvas size the current image's preview was laid out for
+        self._preview_img_id = None # Persistent preview canvas items, created on first draw
+        self._preview_rect_id = None
+        self._cached_total_chunks = None # Chunk count for chunk_folder, set by load_image
+        self._load_exec = None # Worker for background image decodes, created on first use
+        self._pending_load = None # Future of the most recent background decode
+        self._split_exec = None # Worker that writes chunk PNGs to the output folder
+        self._last_open_dir = os.path.dirname(os.path.abspath(original_image_path)) if original_image_path else os.getcwd()
  
         self._load_settings() # Load settings on startup
         self.create_widgets()
@@ -49,16 +78,64 @@ class ControlWindow(ttk.Window):
         if self.original_image_path:
             self.load_image(self.original_image_path)
 
+        # The key hook thread only queues hotkey actions; they run here on the Tk thread
+        self.hotkey_queue = queue.SimpleQueue()
         self.key_poll_thread = threading.Thread(target=poll_global_keys, args=(self,), daemon=True)
         self.key_poll_thread.start()
+        self._hotkey_drain_id = self.after(HOTKEY_DRAIN_INTERVAL_MS, self._drain_hotkey_queue)
+        # The drawing thread queues its GUI updates too, as (kind, value) pairs
+        self._ui_queue = queue.SimpleQueue()
+        self._ui_drain_id = self.after(UI_DRAIN_INTERVAL_MS, self._drain_ui_queue)
 
         self.protocol("WM_DELETE_WINDOW", self.on_close)
 
     def get_total_chunks(self):
         if not self.chunk_folder:
             return 0
-        from image_utils import count_existing_chunks
-        return count_existing_chunks(self.chunk_folder) or (self.num_chunks_x * self.num_chunks_y)
+        # The chunk count only changes when load_image re-splits the image
+        if self._cached_total_chunks is None:
+            self._cached_total_chunks = count_existing_chunks(self.chunk_folder) or (self.num_chunks_x * self.num_chunks_y)
+        return self._cached_total_chunks
+
+    def _drain_hotkey_queue(self):
+        """Runs the hotkey actions queued by the key hook thread."""
+        try:
+            while True:
+                try:
+                    action = self.hotkey_queue.get_nowait()
+                except queue.Empty:
+                    break
+                action()
+        finally:
+            self._hotkey_drain_id = self.after(HOTKEY_DRAIN_INTERVAL_MS, self._drain_hotkey_queue)
+
+    def _drain_ui_queue(self):
+        """
+        Applies the GUI updates queued by the drawing thread. Only the newest
+        progress value is shown, and it is flushed before any queued call runs.
+        """
+        progress = None
+        try:
+            while True:
+                try:
+                    kind, value = self._ui_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if kind == 'progress':
+                    progress = value
+                elif kind == 'mark':
+                    if self.image_window:
+                        for screen_x, screen_y in value:
+                            self.image_window.mark_pixel_as_successful(screen_x, screen_y)
+                elif kind == 'call':
+                    if progress is not None:
+                        self.progress_bar.config(value=progress)
+                        progress = None
+                    value()
+            if progress is not None:
+                self.progress_bar.config(value=progress)
+        finally:
+            self._ui_drain_id = self.after(UI_DRAIN_INTERVAL_MS, self._drain_ui_queue)
 
     def create_widgets(self):
         """Creates all the control widgets in the main window."""
@@ -144,7 +221,7 @@ class ControlWindow(ttk.Window):
 
         self.preview_canvas = tk.Canvas(preview_frame, bg=self.cget('bg'), highlightthickness=0, height=100)
         self.preview_canvas.pack(fill=X, expand=False)
-        self.preview_canvas.bind("<Configure>", self.draw_preview)
+        self.preview_canvas.bind("<Configure>", self.on_preview_configure)
 
        # --- Info/Hotkeys ---
         info_frame = ttk.Frame(main_frame)
@@ -154,6 +231,11 @@ class ControlWindow(ttk.Window):
         self.update_hotkey_info()
 
     def update_hotkey_info(self):
+        # Only rebuild the label when a key has actually been rebound
+        key = frozenset(self.hotkey_map.items())
+        if key == self._hotkey_info_key:
+            return
+        self._hotkey_info_key = key
         info_text = (
             "Hotkeys:\n"
             "  ↑↓: Next/Prev Chunk\n"
@@ -171,26 +253,31 @@ class ControlWindow(ttk.Window):
         try:
             with open('settings.json', 'r') as f:
                 self.settings = json.load(f)
-            print("Drawing settings loaded successfully.")
+            self._saved_settings = dict(self.settings)
+            logger.info("Drawing settings loaded successfully.")
         except (FileNotFoundError, json.JSONDecodeError):
-            print("Settings file not found or invalid. Using defaults.")
+            logger.info("Settings file not found or invalid. Using defaults.")
             # Define default settings here
             self.settings = {
                 'drawing_speed': 0.05,
                 'color_tolerance': 10,
                 'double_click': False,
                 'automated_mode': False,
-                'grouping_sensitivity': 10.0
+                'grouping_sensitivity': 10.0,
+                'fast_grouping': False
             }
 
     def _save_settings(self):
-        """Saves the current drawing settings to a JSON file."""
+        """Saves the current drawing settings to a JSON file, if they changed."""
+        if self.settings == self._saved_settings:
+            return # Already on disk as-is
         try:
             with open('settings.json', 'w') as f:
                 json.dump(self.settings, f, indent=4)
-            print("Drawing settings saved successfully.")
+            self._saved_settings = dict(self.settings)
+            logger.info("Drawing settings saved successfully.")
         except IOError as e:
-            print(f"Error saving settings: {e}")
+            logger.error("Error saving settings: %s", e)
 
     def _load_calibration_data(self):
         """Loads calibration data from the JSON file."""
@@ -198,42 +285,109 @@ class ControlWindow(ttk.Window):
             with open('calibration.json', 'r') as f:
                 data = json.load(f)
                 self.calibration_rect = tuple(data['calibration_rect'])
-                print("Calibration data loaded successfully.")
+                logger.info("Calibration data loaded successfully.")
         except FileNotFoundError:
-            print("Calibration file not found. Please calibrate.")
+            logger.warning("Calibration file not found. Please calibrate.")
         except (IOError, json.JSONDecodeError) as e:
-            print(f"Error loading calibration data: {e}")
+            logger.error("Error loading calibration data: %s", e)
+
+    def _debounce(self, key, delay_ms, fn, *args, leading=False):
+        """
+        Coalesces rapid calls: fn(*args) runs once, `delay_ms` after the last call
+        for `key`. With leading=True the first call of a burst also runs right away,
+        and the trailing call only runs if more calls followed it.
+        """
+        after_id = self._debounce_ids.pop(key, None)
+        if after_id is not None:
+            self.after_cancel(after_id)
+            pending = (fn, args)
+        elif leading:
+            fn(*args)
+            pending = None
+        else:
+            pending = (fn, args)
+        self._debounce_ids[key] = self.after(delay_ms, self._flush_debounce, key, pending)
+
+    def _flush_debounce(self, key, pending):
+        """Runs the last call recorded for a debounced key, if any."""
+        self._debounce_ids.pop(key, None)
+        if pending:
+            fn, args = pending
+            fn(*args)
+
+    def _set_slider(self, slider, value, callback):
+        """Moves a slider and runs its callback once, whether or not set() fires -command."""
+        self._suppress_slider_cb = True
+        try:
+            slider.set(value)
+        finally:
+            self._suppress_slider_cb = False
+        callback(value)
+
+    def _slider_unchanged(self, key, value):
+        """Records a snapped slider value; True if it repeats the last one for `key`."""
+        if self._slider_values.get(key) == value:
+            return True
+        self._slider_values[key] = value
+        return False
 
     def on_chunk_change(self, value):
         """Callback for when the chunk slider is moved."""
-        if not self.image_window:
+        if self._suppress_slider_cb or not self.image_window:
             return
         chunk_index = int(float(value))
+        if self._slider_unchanged('chunk', chunk_index):
+            return
+        self._debounce('chunk', 40, self._apply_chunk, chunk_index)
+
+    def _apply_chunk(self, chunk_index):
+        """Shows the given chunk and updates the label and preview."""
+        if not self.image_window:
+            return
         self.image_window.set_chunk(chunk_index)
         self.chunk_label.config(text=f"Chunk: {chunk_index + 1}/{self.total_chunks}")
-        self.draw_preview()
+        self._render_preview_highlight()
         
     def on_opacity_change(self, value):
         """Callback for when the opacity slider is moved."""
-        if not self.image_window:
+        if self._suppress_slider_cb or not self.image_window:
+            return
+        value = round(float(value), 2)
+        if self._slider_unchanged('opacity', value):
             return
-        self.image_window.set_alpha(float(value))
+        self._debounce('opacity', 30, self._apply_opacity, value)
+
+    def _apply_opacity(self, value):
+        """Applies an opacity value to the image window."""
+        if self.image_window:
+            self.image_window.set_alpha(value)
 
     def on_scale_change(self, value):
         """Callback for when the scale slider is moved."""
-        if not self.image_window:
+        if self._suppress_slider_cb or not self.image_window:
             return
-        self.image_window.set_scale(float(value))
+        value = round(float(value), 2)
+        if self._slider_unchanged('scale', value):
+            return
+        self._debounce('scale', 50, self._apply_scale, value, leading=True)
         if self.image_window.single_chunk_mode:
             self.scale_slider.set(15.0)
 
+    def _apply_scale(self, value):
+        """Applies a scale value to the image window."""
+        if self.image_window:
+            self.image_window.set_scale(value)
+
     def on_toggle_single_chunk(self):
         """Callback for single chunk mode toggle."""
         if not self.image_window:
             self.single_chunk_var.set(False) # Ensure var is in a predictable state
             return
         enabled = self.single_chunk_var.get()
+        if enabled == self.image_window.single_chunk_mode:
+            return # Already in this mode; don't rebuild the window's display
         self.image_window.toggle_single_chunk(enabled)
+        self._slider_values.clear() # The window changed its scale behind the sliders' back
         self.scale_slider.config(state=DISABLED if enabled else NORMAL)
         if enabled:
             self.calibrate_button.config(state=NORMAL if not self.calibration_rect else DISABLED)
@@ -246,7 +400,10 @@ class ControlWindow(ttk.Window):
         if not self.image_window:
             self.clickthrough_var.set(False) # Ensure var is in a predictable state
             return
-        self.image_window.toggle_clickthrough(self.clickthrough_var.get())
+        enabled = self.clickthrough_var.get()
+        if enabled == self.image_window.clickthrough_mode:
+            return # Skip the redundant window style change
+        self.image_window.toggle_clickthrough(enabled)
 
     def open_color_assistant(self):
         """
@@ -257,6 +414,7 @@ class ControlWindow(ttk.Window):
             messagebox.showerror("Error", "Please load an image before opening the Color Assistant.")
             return
 
+        from color_assistant_window import ColorAssistantWindow
         try:
             # Pass the loaded settings to the assistant
             assistant = ColorAssistantWindow(self, self.original_image_path, self.settings)
@@ -269,6 +427,7 @@ class ControlWindow(ttk.Window):
                 self.settings['double_click'] = assistant.double_click.get()
                 self.settings['automated_mode'] = assistant.automated_mode.get()
                 self.settings['grouping_sensitivity'] = assistant.grouping_sensitivity.get()
+                self.settings['fast_grouping'] = assistant.fast_grouping.get()
 
                 if assistant.selected_colors and self.image_window:
                     # The drawing logic remains here
@@ -303,8 +462,12 @@ class ControlWindow(ttk.Window):
             return
 
         self.is_drawing = True
+        self._stop_drawing.clear()
         self.color_assistant_button.config(state=DISABLED)
         self.image_window.highlight_colors(all_colors, tolerance)
+        # Placement and geometry are read here on the Tk thread; the scan itself
+        # runs on the drawing thread
+        locate_pixels = self.image_window.pixel_locator(all_colors)
         self.stop_drawing_button.pack(pady=5, fill=X)
         self.progress_bar.pack(pady=5, fill=X)
         
@@ -313,10 +476,9 @@ class ControlWindow(ttk.Window):
         self.on_toggle_clickthrough()
 
         # This should run in a separate thread to avoid freezing the GUI
-        threading.Thread(target=self._drawing_thread, args=(primary_color, all_colors, speed, tolerance, double_click), daemon=True).start()
+        threading.Thread(target=self._drawing_thread, args=(primary_color, all_colors, speed, tolerance, double_click, locate_pixels), daemon=True).start()
 
-    def _drawing_thread(self, primary_color, all_colors, speed, tolerance, double_click):
-        
+    def _drawing_thread(self, primary_color, all_colors, speed, tolerance, double_click, locate_pixels):
         def _finish_drawing():
             """Called on the main thread to clean up the GUI after drawing."""
             if self.image_window:
@@ -338,111 +500,221 @@ class ControlWindow(ttk.Window):
             
             self.clickthrough_var.set(False)
             self.on_toggle_clickthrough()
-            print("Automated drawing finished.")
+            logger.info("Automated drawing finished.")
 
         try:
-            pyautogui.PAUSE = 0
-            pyautogui.MINIMUM_DURATION = 0
-
             if not self.image_window or not (self.image_window.target_x is not None and self.image_window.target_w is not None):
-                messagebox.showerror("Not Calibrated", "Please calibrate the drawing area first.")
-                self.after(0, _finish_drawing)
+                self._ui_queue.put(('call', lambda: messagebox.showerror(
+                    "Not Calibrated", "Please calibrate the drawing area first."
+                )))
                 return
 
             # --- 1. Get initial ORDERED list of pixels to draw ---
             # DO NOT CONVERT TO A SET. Keep it as a list to preserve order.
-            pixels_to_try = self.image_window.get_pixel_locations_for_colors(all_colors)
+            pixels_to_try = locate_pixels()
             if not pixels_to_try:
-                print("No pixels of the specified color found.")
-                self.after(0, _finish_drawing)
+                logger.info("No pixels of the specified color found.")
                 return
 
             # --- 2. Setup for retries and progress tracking ---
-            retry_counts = {loc: 0 for loc in pixels_to_try}
+            # Pixels stay in order as rows of an (N, 2) array; each pixel's retry
+            # count lives at the same position in a parallel array
+            pixels_to_try = np.array(pixels_to_try, dtype=np.int32)
+            # Verification compares against the palette as one int16 array
+            palette = np.asarray(all_colors, dtype=np.int16).reshape(-1, 3)
             MAX_RETRIES = 3
             total_pixels = len(pixels_to_try)
-            completed_count = 0
+
+            # Pixels that already show a palette color (e.g. from an earlier, stopped
+            # run) count as complete up front and are never drawn. The overlay
+            # paints every target cell in a palette color, so this is only trusted
+            # from a screenshot taken while it is off the screen.
+            already_drawn = np.zeros(total_pixels, dtype=bool)
+            overlay_state = self._call_on_ui(self._withdraw_overlay)
+            if overlay_state is not None:
+                try:
+                    # Give the desktop time to repaint where the overlay was
+                    time.sleep(SCREENSHOT_DELAY)
+                    already_drawn = self._verify_drawn_pixels(pixels_to_try, palette, tolerance)
+                except Exception as e:
+                    logger.warning("Could not pre-scan %d pixels: %s", total_pixels, e)
+                finally:
+                    if overlay_state == 'normal':
+                        self._ui_queue.put(('call', self._restore_overlay))
+            ui_queue = self._ui_queue
+            ui_queue.put(('mark', pixels_to_try[already_drawn].tolist()))
+            pixels_to_try = pixels_to_try[~already_drawn]
+            retry_counts = np.zeros(len(pixels_to_try), dtype=np.uint8)
+            # Neighbouring drawn pixels on a row sit about one scaled pixel apart;
+            # below 1:1 scale distinct pixels can land on the same screen column,
+            # so every pixel keeps its own stroke
+            chunk_w = self.image_window.get_current_chunk_size()[0]
+            pixel_pitch = self.image_window.img_width / chunk_w if chunk_w else 0
+            max_stroke_gap = pixel_pitch + 0.5 if pixel_pitch >= 1 else 0
+            completed_count = int(already_drawn.sum())
+            posted_count = completed_count # Last value sent to the progress bar
             
-            self.after(0, lambda: self.progress_bar.config(maximum=total_pixels, value=0))
+            ui_queue.put(('call', lambda p=completed_count: self.progress_bar.config(maximum=total_pixels, value=p)))
             
-            original_pos = pyautogui.position()
+            original_pos = win32api.GetCursorPos()
+
+            # Bind the per-pixel calls once; the inner loop runs thousands of times
+            get_cursor_pos = win32api.GetCursorPos
+            stopped = self._stop_drawing.is_set
+            sleep = time.sleep
+            verify = self._verify_drawn_pixels
 
             # --- 3. The new ORDERED drawing loop ---
-            while pixels_to_try and self.is_drawing:
-                failed_this_pass = []
+            stroke_gap = max_stroke_gap
+            while len(pixels_to_try) and not stopped():
+                failed_this_pass = np.zeros(len(pixels_to_try), dtype=bool)
                 
-                # Iterate through the current list of pixels to try this pass
-                for pixel_location in pixels_to_try:
-                    if not self.is_drawing:
-                        break # Exit inner loop if user stopped
-                    
-                    (screen_x, screen_y) = pixel_location
-
-                    # A. --- MODIFIED DRAWING ACTION ---
-                    # Replace the simple click with a more robust, tiny drag.
-                    
-                    # Move to the target pixel first.
-                    pyautogui.moveTo(screen_x, screen_y)
-                    
-                    if double_click:
-                        # Perform a standard click first (to select the tool/color)
-                        pyautogui.click()
-                        # Then perform the tiny drag to apply the color
-                        pyautogui.dragRel(0, 1, duration=0.05, button='left')
-                    else:
-                        # Just perform the tiny drag. This holds the left button,
-                        # moves 1 pixel down, and releases.
-                        pyautogui.dragRel(0, 1, duration=0.05, button='left')
-
-                    # The user-defined speed delay is still respected after the action
-                    if speed > 0:
-                        time.sleep(speed)
-
-                    # B. Verify the click
+                # Draw the pass in batches; each batch is verified with a single screenshot
+                for batch_start in range(0, len(pixels_to_try), VERIFY_BATCH_SIZE):
+                    drawn = []
+                    batch_pixels = pixels_to_try[batch_start:batch_start + VERIFY_BATCH_SIZE]
+                    for run in self._split_into_strokes(batch_pixels, stroke_gap):
+                        if stopped():
+                            break # Exit inner loop if user stopped
+
+                        # Fail-safe: slamming the mouse into the top-left corner aborts
+                        if get_cursor_pos() == (0, 0):
+                            logger.warning("Fail-safe triggered from mouse position (0, 0). Stopping.")
+                            self._stop_drawing.set()
+                            break
+
+                        # A. --- MODIFIED DRAWING ACTION ---
+                        # Replace the simple click with a more robust, tiny drag:
+                        # hold the left button, sweep across the run of neighbouring
+                        # pixels, move 1 pixel down, and release.
+                        run = run.tolist()
+                        draw_stroke(run, hold=0.05, click_first=double_click)
+
+                        # The user-defined speed delay is still respected after the action
+                        if speed > 0:
+                            sleep(speed)
+                        drawn.extend(run)
+
+                    if not drawn:
+                        break
+
+                    # B. Verify the batch
                     try:
-                        pixel_img = ImageGrab.grab(bbox=(screen_x, screen_y, screen_x + 1, screen_y + 1))
-                        current_pixel_color = pixel_img.getpixel((0, 0))
-                        is_successfully_drawn = any(colors_are_similar(current_pixel_color, c, tolerance) for c in all_colors)
+                        matches = verify(drawn, palette, tolerance)
                     except Exception as e:
-                        print(f"Could not verify pixel at ({screen_x}, {screen_y}): {e}")
-                        is_successfully_drawn = False # Treat verification error as a failure
+                        logger.warning("Could not verify %d pixels starting at %s: %s", len(drawn), drawn[0], e)
+                        matches = np.zeros(len(drawn), dtype=bool) # Treat verification error as a failure
 
                     # C. Handle success or failure
-                    if is_successfully_drawn:
-                        # Success! Mark it and increment completion count.
-                        if self.image_window:
-                            self.image_window.mark_pixel_as_successful(screen_x, screen_y)
-                        completed_count += 1
-                    else:
-                        # Failure! Check retry count.
-                        retry_counts[pixel_location] += 1
-                        if retry_counts[pixel_location] < MAX_RETRIES:
-                            failed_this_pass.append(pixel_location) # Re-queue for the next pass
-                        else:
-                            # Gave up on this pixel, but it's "complete" for progress purposes
-                            print(f"Pixel at {pixel_location} failed to draw after {MAX_RETRIES} attempts. Skipping.")
-                            completed_count += 1
+                    # Success! Mark it and count it as complete.
+                    ui_queue.put(('mark', np.compress(matches, drawn, axis=0).tolist()))
+
+                    # Failure! Bump the retry counts of this batch's misses.
+                    batch = slice(batch_start, batch_start + len(drawn))
+                    batch_retries = retry_counts[batch]
+                    batch_retries[~matches] += 1
+                    gave_up = ~matches & (batch_retries >= MAX_RETRIES)
+                    failed_this_pass[batch] = ~matches & ~gave_up # Re-queue for the next pass
+                    for pixel_location in np.compress(gave_up, drawn, axis=0).tolist():
+                        # Gave up on this pixel, but it's "complete" for progress purposes
+                        logger.debug("Pixel at %s failed to draw after %d attempts. Skipping.", tuple(pixel_location), MAX_RETRIES)
+                    completed_count += int(matches.sum() + gave_up.sum())
                     
-                    # Update progress bar after every attempt
-                    self.after(0, lambda p=completed_count: self.progress_bar.config(value=p))
+                    # Update progress bar after every batch that moved it
+                    if completed_count != posted_count:
+                        posted_count = completed_count
+                        ui_queue.put(('progress', completed_count))
 
-                if not self.is_drawing:
+                if stopped():
                     break # Exit outer loop if user stopped
 
-                # Prepare for the next pass with only the pixels that failed
-                pixels_to_try = failed_this_pass
+                # Prepare for the next pass with only the pixels that failed. Misses
+                # next to each other would join into the same stroke and could fail
+                # the same way again, so retries are drawn one pixel per stroke
+                pixels_to_try = pixels_to_try[failed_this_pass]
+                retry_counts = retry_counts[failed_this_pass]
+                stroke_gap = 0
 
-            pyautogui.moveTo(original_pos)
+            win32api.SetCursorPos(original_pos)
 
         except Exception as e:
-            print(f"An error occurred during automated drawing: {e}")
+            logger.error("An error occurred during automated drawing: %s", e)
         finally:
-            pyautogui.PAUSE = 0.1
-            self.after(0, _finish_drawing)
+            # Queued behind the last markers, so clearing them can't race ahead
+            self._ui_queue.put(('call', _finish_drawing))
+
+    def _call_on_ui(self, fn, timeout=2.0):
+        """
+        Runs fn on the Tk thread from the drawing thread and waits for it.
+        Returns fn's result, or None if it failed or had not started within
+        `timeout` seconds; in that case it is cancelled and never runs later.
+        """
+        done = threading.Event()
+        lock = threading.Lock()
+        state = {'started': False, 'cancelled': False}
+        result = []
+
+        def call():
+            with lock:
+                if state['cancelled']:
+                    return
+                state['started'] = True
+            try:
+                result.append(fn())
+            finally:
+                done.set()
+
+        self._ui_queue.put(('call', call))
+        if not done.wait(timeout):
+            with lock:
+                if not state['started']:
+                    state['cancelled'] = True
+                    return None
+            # Already running on the Tk thread; its effects must be seen through
+            done.wait()
+        return result[0] if result else None
+
+    def _withdraw_overlay(self):
+        """Takes the overlay off the screen ahead of a screenshot; returns its previous state."""
+        if not self.image_window:
+            return None
+        state = self.image_window.state()
+        if state == 'normal':
+            self.image_window.withdraw()
+            self.update_idletasks()
+        return state
+
+    def _restore_overlay(self):
+        """Shows the overlay again after _withdraw_overlay hid it."""
+        if self.image_window:
+            self.image_window.deiconify()
+
+    @staticmethod
+    def _split_into_strokes(pixels, max_gap):
+        """
+        Splits an ordered (N, 2) array of screen pixels into runs that can share
+        one stroke: consecutive pixels on the same row at most `max_gap` apart.
+        """
+        step = np.diff(pixels, axis=0)
+        joined = (step[:, 1] == 0) & (step[:, 0] > 0) & (step[:, 0] <= max_gap)
+        return np.split(pixels, np.flatnonzero(~joined) + 1)
+
+    @staticmethod
+    def _verify_drawn_pixels(locations, palette, tolerance):
+        """
+        Checks drawn screen pixels against the palette using one screenshot of
+        their bounding box. Returns a boolean array, one entry per location.
+        """
+        xs, ys = np.array(locations).T
+        x0, y0 = int(xs.min()), int(ys.min())
+        shot = ImageGrab.grab(bbox=(x0, y0, int(xs.max()) + 1, int(ys.max()) + 1))
+        screen = np.asarray(shot)[..., :3] # Drop alpha without an extra convert() copy
+        # Gather just the drawn pixels before comparing, rather than matching the whole box
+        return colors_within_tolerance(screen[ys - y0, xs - x0], palette, tolerance)
 
     def stop_automated_drawing(self):
         """Stops the drawing process."""
-        self.is_drawing = False
+        self._stop_drawing.set()
 
     def calibrate_single_chunk(self):
         """
@@ -451,6 +723,7 @@ class ControlWindow(ttk.Window):
         if not self.single_chunk_var.get() or not self.image_window:
             return
 
+        from calibration_window import CalibrationWindow
         self.is_calibrating = True
         
         try:
@@ -468,6 +741,12 @@ class ControlWindow(ttk.Window):
             self.is_calibrating = False
 
 
+    def on_preview_configure(self, event=None):
+        """Callback for preview canvas resizes; redraws once per resize burst."""
+        # Every distinct size in a window drag would otherwise render and cache
+        # its own PhotoImage, evicting the sizes that are actually reused
+        self._debounce('preview', 50, self.draw_preview, leading=True)
+
     def draw_preview(self, event=None):
         """Draws the preview image and chunk highlight on its canvas."""
         if not self.original_pil_image:  # Don't draw if no image is loaded
@@ -478,42 +757,130 @@ class ControlWindow(ttk.Window):
         if canvas_w < 20 or canvas_h < 20:  # Don't draw if canvas is too small
             return
 
-        self.preview_canvas.delete("all")
-        
+        # <Configure> also fires without a size change; the bitmap only depends on the size
+        if (canvas_w, canvas_h) != self._preview_canvas_size:
+            self._render_preview_bitmap(canvas_w, canvas_h)
+            self._preview_canvas_size = (canvas_w, canvas_h)
+        self._render_preview_highlight()
+
+    def _render_preview_bitmap(self, canvas_w, canvas_h):
+        """Draws the scaled preview image, reusing the cached bitmap for this size."""
         # Calculate scale to fit image in canvas
         img_w, img_h = self.original_pil_image.size
         scale = min(canvas_w / img_w, canvas_h / img_h)
         preview_w, preview_h = int(img_w * scale), int(img_h * scale)
 
-        # Create and display preview image
-        preview_img = self.original_pil_image.resize((preview_w, preview_h), Image.Resampling.LANCZOS)
+        # Render the preview only the first time this size is needed for this image
+        key = (preview_w, preview_h, self._preview_mip.mode)
+        photo = self._preview_cache.get(key)
+        if photo is None or key not in self._preview_fresh:
+            # BILINEAR is enough for a sidebar-sized preview; reducing_gap lets Pillow
+            # box-reduce the mip by an integer factor first when the canvas is much smaller
+            preview_img = self._preview_mip.resize(
+                (preview_w, preview_h), Image.Resampling.BILINEAR, reducing_gap=2.0
+            )
+            if photo is None:
+                if len(self._preview_cache) >= 4:
+                    # Drop the oldest size so window resizing can't grow the cache unbounded
+                    oldest = next(iter(self._preview_cache))
+                    del self._preview_cache[oldest]
+                    self._preview_fresh.discard(oldest)
+                photo = ImageTk.PhotoImage(preview_img)
+                self._preview_cache[key] = photo
+            else:
+                # Repaint the Tk image left over from a previous load instead of allocating one
+                photo.paste(preview_img)
+            self._preview_fresh.add(key)
         # Use a different attribute name to avoid conflicts
-        self.preview_tk_image_ref = ImageTk.PhotoImage(preview_img)
-        self.preview_canvas.create_image(canvas_w / 2, canvas_h / 2, image=self.preview_tk_image_ref, anchor='center')
+        self.preview_tk_image_ref = photo
+        # The image item is created once and then only repointed and re-centred
+        if self._preview_img_id is None:
+            self._preview_img_id = self.preview_canvas.create_image(
+                canvas_w / 2, canvas_h / 2, image=self.preview_tk_image_ref, anchor='center'
+            )
+        else:
+            self.preview_canvas.itemconfigure(self._preview_img_id, image=self.preview_tk_image_ref)
+            self.preview_canvas.coords(self._preview_img_id, canvas_w / 2, canvas_h / 2)
 
-        # Draw highlight on the current chunk
-        chunk_index = int(self.chunk_slider.get())
-        row = chunk_index // self.num_chunks_x
-        col = chunk_index % self.num_chunks_x
-        
-        chunk_w_preview = scale * CHUNK_SIZE
-        chunk_h_preview = scale * CHUNK_SIZE
-        
         # Calculate top-left corner of the preview image on the canvas
         offset_x = (canvas_w - preview_w) / 2
         offset_y = (canvas_h - preview_h) / 2
+        # Only the chunk index changes between highlight redraws, so lay out the chunk
+        # grid lines once here; a chunk spans grid lines col..col+1 and row..row+1
+        chunk_size_preview = scale * CHUNK_SIZE
+        self._preview_geom = (
+            [offset_x + col * chunk_size_preview for col in range(self.num_chunks_x + 1)],
+            [offset_y + row * chunk_size_preview for row in range(self.num_chunks_y + 1)],
+        )
 
-        x1 = offset_x + col * chunk_w_preview
-        y1 = offset_y + row * chunk_h_preview
-        x2 = x1 + chunk_w_preview
-        y2 = y1 + chunk_h_preview
+    def _render_preview_highlight(self):
+        """Redraws only the highlight rectangle on the current chunk."""
+        if not self._preview_geom:
+            return
+        grid_xs, grid_ys = self._preview_geom
 
-        self.preview_canvas.create_rectangle(x1, y1, x2, y2, outline=HIGHLIGHT_COLOR, width=2)
+        # Draw highlight on the current chunk
+        row, col = divmod(int(self.chunk_slider.get()), self.num_chunks_x)
+        x1, x2 = grid_xs[col], grid_xs[col + 1]
+        y1, y2 = grid_ys[row], grid_ys[row + 1]
+
+        # Created once above the image item, then only moved
+        if self._preview_rect_id is None:
+            self._preview_rect_id = self.preview_canvas.create_rectangle(
+                x1, y1, x2, y2, outline=HIGHLIGHT_COLOR, width=2, tags="highlight"
+            )
+        else:
+            self.preview_canvas.coords(self._preview_rect_id, x1, y1, x2, y2)
+
+    @staticmethod
+    def _decode_image(image_path):
+        """Fully decodes an image and builds its preview mip; safe to run off the Tk thread."""
+        image = Image.open(image_path)
+        image.load()
+        # Downscale once with LANCZOS; preview redraws resize from this smaller copy
+        preview_mip = image.copy()
+        preview_mip.thumbnail((1024, 1024), Image.Resampling.LANCZOS)
+        return image, preview_mip
 
     def load_image(self, image_path):
         """Loads and processes the image from the given path."""
+        self._apply_loaded_image(image_path, *self._decode_image(image_path))
+
+    def load_image_in_background(self, image_path):
+        """Decodes the image on a worker thread, then loads it on the Tk thread."""
+        if self._load_exec is None:
+            self._load_exec = ThreadPoolExecutor(max_workers=1)
+        future = self._load_exec.submit(self._decode_image, image_path)
+        self._pending_load = future
+        self.load_button.config(text="Loading...")
+        self.after(50, lambda: self._poll_load(future, image_path))
+
+    def _poll_load(self, future: Future, image_path):
+        """Waits for a background decode and applies it once it completes."""
+        if future is not self._pending_load:
+            return  # Superseded by a newer load
+        if not future.done():
+            self.after(50, lambda: self._poll_load(future, image_path))
+            return
+
+        self._pending_load = None
+        self.load_button.config(text="Load Image")
+        try:
+            image, preview_mip = future.result()
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not load image: {e}")
+            return
+        self._apply_loaded_image(image_path, image, preview_mip)
+
+    def _apply_loaded_image(self, image_path, image, preview_mip):
+        """Sets up the chunk grid for a decoded image and updates the GUI for it."""
         self.original_image_path = image_path
-        self.original_pil_image = Image.open(self.original_image_path)
+        self.original_pil_image = image
+        self._preview_mip = preview_mip
+        self._preview_fresh.clear() # Keep the PhotoImages so the next draw can repaint them
+        self._slider_values.clear() # A new image needs chunk 0 drawn even if it was current
+        self._preview_geom = None
+        self._preview_canvas_size = None
 
         # --- Create output folder ---
         base_name = os.path.splitext(os.path.basename(self.original_image_path))[0]
@@ -521,91 +888,100 @@ class ControlWindow(ttk.Window):
         os.makedirs(self.chunk_folder, exist_ok=True)
 
         # --- Split image into chunks ---
-        from image_utils import split_image_into_chunks
-        self.num_chunks_x, self.num_chunks_y, self.total_chunks = split_image_into_chunks(
-            self.original_image_path, self.chunk_folder
-        )
+        # The overlay crops chunks from the image in memory, so only the grid is
+        # needed here; the chunk PNGs are written to the output folder in the background
+        # unless a previous load already wrote them for this version of the image
+        self.num_chunks_x, self.num_chunks_y, self.total_chunks = get_chunk_info(self.original_image_path)
+        self._cached_total_chunks = self.total_chunks
+        if not chunks_up_to_date(self.original_image_path, self.chunk_folder, self.total_chunks):
+            if self._split_exec is None:
+                self._split_exec = ThreadPoolExecutor(max_workers=1)
+            self._split_exec.submit(
+                split_image_into_chunks, self.original_image_path, self.chunk_folder
+            ).add_done_callback(self._on_split_done)
 
         # --- Update GUI ---
         self.title(f"Dither-it Control - {os.path.basename(self.original_image_path)}")
-        self.chunk_slider.config(to=self.total_chunks - 1, state=NORMAL)
-        self.opacity_slider.config(state=NORMAL)
-        self.scale_slider.config(state=NORMAL)
         self.chunk_label.config(text=f"Chunk: 1/{self.total_chunks}")
-        self.calibrate_button.config(state=DISABLED)
         self.color_assistant_button.config(state=NORMAL)
 
         # --- Create ImageWindow ---
         if self.image_window:
-            self.image_window.destroy()
-        self.image_window = ImageWindow(self, self.original_pil_image, self.num_chunks_x, self.num_chunks_y)
+            self.image_window.reload(self.original_pil_image, self.num_chunks_x, self.num_chunks_y)
+        else:
+            self.image_window = ImageWindow(self, self.original_pil_image, self.num_chunks_x, self.num_chunks_y)
         if self.calibration_rect:
             x_min, y_min, width, height = self.calibration_rect
             self.image_window.set_calibration(x_min, y_min, width, height)
-        
-        self.chunk_slider.config(to=self.total_chunks - 1, state=NORMAL)
-        self.chunk_slider.set(0)
-        self.on_chunk_change(0)
-        self.draw_preview()
 
+        # A reused window keeps its single chunk mode, so match the controls to it
+        single_chunk = self.image_window.single_chunk_mode
+        self.chunk_slider.config(to=self.total_chunks - 1, state=NORMAL)
         self.opacity_slider.config(state=NORMAL)
-        self.scale_slider.config(state=NORMAL)
+        self.scale_slider.config(state=DISABLED if single_chunk else NORMAL)
+        self.calibrate_button.config(state=NORMAL if single_chunk and not self.calibration_rect else DISABLED)
 
+        self._set_slider(self.chunk_slider, 0, self.on_chunk_change)
+        self.draw_preview()
 
+    @staticmethod
+    def _on_split_done(future: Future):
+        """Reports a failed background split; runs on the worker thread."""
+        if not future.cancelled() and future.exception():
+            logger.error("Error writing image chunks: %s", future.exception())
 
     def load_image_from_dialog(self):
         """Opens a file dialog to select an image and loads it."""
         filepath = filedialog.askopenfilename(
             title="Select an Image",
-            filetypes=([("Image Files", "*.png *.jpg *.jpeg *.bmp *.gif"), ("All files", "*.*")]),
+            initialdir=self._last_open_dir,
+            filetypes=IMAGE_FILETYPES,
         )
         if not filepath:
             return
 
-        self.load_image(filepath)
+        # Reopen in the same folder so the dialog doesn't rescan the working directory
+        self._last_open_dir = os.path.dirname(filepath)
+        self.load_image_in_background(filepath)
     # --- Methods for global key polling ---
+    @staticmethod
+    def _step_tenths(value, steps, lowest, highest):
+        """Moves value by whole 0.1 steps on an integer grid, so repeated presses can't drift."""
+        step = round(value * 10) + steps
+        step = max(round(lowest * 10), min(round(highest * 10), step))
+        return step / 10
+
     def next_chunk(self):
         current_index = int(self.chunk_slider.get())
         next_index = (current_index + 1) % self.total_chunks
-        self.chunk_slider.set(next_index)
-        self.on_chunk_change(next_index)
+        self._set_slider(self.chunk_slider, next_index, self.on_chunk_change)
 
     def prev_chunk(self):
         current_index = int(self.chunk_slider.get())
         prev_index = (current_index - 1 + self.total_chunks) % self.total_chunks
-        self.chunk_slider.set(prev_index)
-        self.on_chunk_change(prev_index)
+        self._set_slider(self.chunk_slider, prev_index, self.on_chunk_change)
 
     def increase_opacity(self):
-        current_value = self.opacity_slider.get()
-        new_value = min(MAX_ALPHA, round(current_value + 0.1, 2))
-        self.opacity_slider.set(new_value)
-        self.on_opacity_change(new_value)
+        new_value = self._step_tenths(self.opacity_slider.get(), 1, MIN_ALPHA, MAX_ALPHA)
+        self._set_slider(self.opacity_slider, new_value, self.on_opacity_change)
 
     def decrease_opacity(self):
-        current_value = self.opacity_slider.get()
-        new_value = max(MIN_ALPHA, round(current_value - 0.1, 2))
-        self.opacity_slider.set(new_value)
-        self.on_opacity_change(new_value)
+        new_value = self._step_tenths(self.opacity_slider.get(), -1, MIN_ALPHA, MAX_ALPHA)
+        self._set_slider(self.opacity_slider, new_value, self.on_opacity_change)
 
     def increase_scale(self):
         if self.image_window and not self.image_window.single_chunk_mode:
-            current_value = self.scale_slider.get()
-            new_value = min(MAX_SCALE, current_value + 0.1)
-            self.scale_slider.set(new_value)
-            self.on_scale_change(new_value)
+            new_value = self._step_tenths(self.scale_slider.get(), 1, MIN_SCALE, MAX_SCALE)
+            self._set_slider(self.scale_slider, new_value, self.on_scale_change)
 
     def decrease_scale(self):
         if self.image_window and not self.image_window.single_chunk_mode:
-            current_value = self.scale_slider.get()
-            new_value = max(MIN_SCALE, current_value - 0.1)
-            self.scale_slider.set(new_value)
-            self.on_scale_change(new_value)
+            new_value = self._step_tenths(self.scale_slider.get(), -1, MIN_SCALE, MAX_SCALE)
+            self._set_slider(self.scale_slider, new_value, self.on_scale_change)
             
     def reset_scale(self):
         if self.image_window and not self.image_window.single_chunk_mode:
-            self.scale_slider.set(DEFAULT_SCALE)
-            self.on_scale_change(DEFAULT_SCALE)
+            self._set_slider(self.scale_slider, DEFAULT_SCALE, self.on_scale_change)
 
     def toggle_clickthrough_mode(self):
         self.clickthrough_var.set(not self.clickthrough_var.get())
@@ -638,9 +1014,25 @@ class ControlWindow(ttk.Window):
     def on_close(self):
         """Handle the window closing event."""
         self._save_settings() # Save settings before closing
-        print("Closing application...")
+        logger.info("Closing application...")
+        for after_id in self._debounce_ids.values():
+            self.after_cancel(after_id)
+        self._debounce_ids.clear()
+        if self._pending_load is not None:
+            self._pending_load.cancel()  # shutdown's cancel_futures needs Python 3.9
+        self._pending_load = None
+        if self._load_exec:
+            self._load_exec.shutdown(wait=False)
+        if self._split_exec:
+            self._split_exec.shutdown(wait=False)  # Let a running split finish its files
+        self._stop_drawing.set()
         self.stop_polling = True
+        self.after_cancel(self._hotkey_drain_id)
+        self.after_cancel(self._ui_drain_id)
+        stop_global_key_polling(self.key_poll_thread)
         self.key_poll_thread.join(timeout=1) # Wait for poll thread to finish
+        if self._sct:
+            self._sct.close()
         if self.image_window:
             self.image_window.clear_cache()  # Clear cache before destroying
             self.image_window.destroy()
@@ -2,20 +2,136 @@
 Utility functions for image processing operations.
 Centralizes image splitting and other image-related functionality.
 """
+import json
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from PIL import Image
 from config import CHUNK_SIZE
 import numpy as np
-# Import DBSCAN and remove KMeans
-from sklearn.cluster import DBSCAN
-from skimage.color import rgb2lab, lab2rgb
-from collections import defaultdict
 
 
-def extract_color_groups(image_path, eps: float = 10.0, min_samples_pct=0.05):
+def _open_image(image_path):
+    """
+    Opens an image, reporting a missing file in the same words as the public
+    functions always have. Letting the open fail saves a separate exists() stat.
+    """
+    try:
+        return Image.open(image_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Image file not found: {image_path}") from None
+
+def _get_thumbnail(image_path, max_side=150):
+    """Returns the memoized _load_thumbnail array for the file's current version."""
+    try:
+        mtime = os.path.getmtime(image_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Image file not found: {image_path}") from None
+    return _load_thumbnail(image_path, mtime, max_side)
+
+@lru_cache(maxsize=8)
+def _load_thumbnail(image_path, mtime, max_side):
+    """
+    Decodes an image into a read-only (H, W, 3) uint8 RGB thumbnail no larger
+    than `max_side`. Memoized so back-to-back analyses of the same file only
+    decode it once; `mtime` invalidates entries when the file changes.
+    """
+    # NEAREST keeps only colors that really occur in the image, so the colors
+    # found from the thumbnail match actual source pixels. JPEGs are not draft()
+    # decoded for the same reason: a reduced DCT scale averages neighbouring
+    # pixels into colors the full-size image never contains
+    image = _open_image(image_path)
+    image = image.convert('RGB')
+    image.thumbnail((max_side, max_side), Image.Resampling.NEAREST)
+    thumbnail = np.array(image)
+    thumbnail.flags.writeable = False
+    return thumbnail
+
+def _pack_rgb(pixels):
+    """Packs an (N, 3) uint8 array into 24-bit uint32 keys that sort in (R, G, B) order."""
+    return (pixels[:, 0].astype(np.uint32) << 16) | (pixels[:, 1].astype(np.uint32) << 8) | pixels[:, 2]
+
+def _unique_rgb(pixels, return_counts=False):
+    """
+    np.unique(pixels, axis=0) for an (N, 3) uint8 array, run on the colors packed
+    into 24-bit integer keys: a 1-D unique is far cheaper than a row-wise one, and
+    the keys sort in the same (R, G, B) order.
+    """
+    pixels = np.asarray(pixels, dtype=np.uint8).reshape(-1, 3)
+    result = np.unique(_pack_rgb(pixels), return_counts=return_counts)
+    unique_keys = result[0] if return_counts else result
+    colors = np.stack([unique_keys >> 16, unique_keys >> 8, unique_keys], axis=1).astype(np.uint8)
+    return (colors, result[1]) if return_counts else colors
+
+# CIELAB values of recently grouped colors as (sorted packed keys, LAB rows), so
+# regrouping an image (e.g. with another eps) or a similar one skips rgb2lab for
+# every color already seen. Replaced wholesale, never mutated, so readers on other
+# threads always see a consistent pair
+_CIELAB_CACHE_LIMIT = 65536
+_cielab_cache = (np.empty(0, dtype=np.uint32), np.empty((0, 3)))
+
+def _rgb_to_cielab(colors):
+    """Converts an (N, 3) uint8 RGB array to CIELAB, reusing cached conversions."""
+    global _cielab_cache
+    from skimage.color import rgb2lab
+
+    keys = _pack_rgb(colors)
+    known_keys, known_lab = _cielab_cache
+    lab = np.empty((len(colors), 3))
+    if len(known_keys):
+        positions = np.minimum(np.searchsorted(known_keys, keys), len(known_keys) - 1)
+        hits = known_keys[positions] == keys
+        lab[hits] = known_lab[positions[hits]]
+    else:
+        hits = np.zeros(len(colors), dtype=bool)
+
+    misses = ~hits
+    if misses.any():
+        lab[misses] = rgb2lab(colors[misses] / 255.0)
+        # Start over once the cache is full rather than track per-color recency
+        if len(known_keys) + misses.sum() > _CIELAB_CACHE_LIMIT:
+            known_keys, known_lab = known_keys[:0], known_lab[:0]
+        new_keys = np.concatenate([known_keys, keys[misses]])
+        new_lab = np.concatenate([known_lab, lab[misses]])
+        order = np.argsort(new_keys)
+        _cielab_cache = (new_keys[order], new_lab[order])
+    return lab
+
+# sRGB -> OkLab conversion (Bjorn Ottosson, 2020) for extract_color_groups' fast_lab
+# path. The gamma curve only ever sees uint8 channels, so it is a 256-entry table
+_SRGB_LEVELS = np.arange(256) / 255.0
+_SRGB_TO_LINEAR = np.where(
+    _SRGB_LEVELS <= 0.04045, _SRGB_LEVELS / 12.92, ((_SRGB_LEVELS + 0.055) / 1.055) ** 2.4
+)
+_OKLAB_M1 = np.array([
+    [0.4122214708, 0.5363325363, 0.0514459929],
+    [0.2119034982, 0.6806995451, 0.1073969566],
+    [0.0883024619, 0.2817188376, 0.6299787005],
+])
+_OKLAB_M2 = np.array([
+    [0.2104542553, 0.7936177850, -0.0040720468],
+    [1.9779984951, -2.4285922050, 0.4505937099],
+    [0.0259040371, 0.7827717662, -0.8086757660],
+])
+# Scales (L, a, b) so that small OkLab distances roughly match CIELAB delta E,
+# keeping `eps` meaningful in both spaces (fitted on random near-color pairs)
+_OKLAB_SCALE = np.array([120.0, 360.0, 360.0])
+
+def _rgb_to_oklab(colors):
+    """Converts an (N, 3) uint8 RGB array to scaled OkLab (see _OKLAB_SCALE)."""
+    lms = _SRGB_TO_LINEAR[colors] @ _OKLAB_M1.T
+    return (np.cbrt(lms) @ _OKLAB_M2.T) * _OKLAB_SCALE
+
+def _oklab_to_rgb(lab):
+    """Converts scaled OkLab back to sRGB floats in [0, 1]; any leading shape."""
+    lms = (lab / _OKLAB_SCALE) @ np.linalg.inv(_OKLAB_M2).T
+    linear = np.clip((lms ** 3) @ np.linalg.inv(_OKLAB_M1).T, 0.0, 1.0)
+    return np.where(linear <= 0.0031308, linear * 12.92, 1.055 * linear ** (1 / 2.4) - 0.055)
+
+def extract_color_groups(image_path, eps: float = 10.0, min_samples_pct=0.05, fast_lab: bool = False):
     """
     Extracts and groups perceptually similar colors from an image using DBSCAN
-    clustering in the CIELAB color space.
+    clustering in the CIELAB color space (or OkLab, with `fast_lab`).
 
     This method is effective at finding distinct color families without
     specifying the number of groups in advance.
@@ -24,88 +140,108 @@ def extract_color_groups(image_path, eps: float = 10.0, min_samples_pct=0.05):
         image_path (str): Path to the source image.
         eps (float): The maximum distance (in LAB space) between two samples
                      for one to be considered as in the neighborhood of the other.
-                     Lower values result in more, tighter color groups.
+                     Lower values result in more, tighter color groups. With
+                     `fast_lab` it is measured in the scaled OkLab space instead,
+                     where it means roughly the same CIELAB delta E.
         min_samples_pct (float): The percentage of total pixels required to form a
                                  dense region (a color group).
+        fast_lab (bool): Cluster in OkLab, scaled to roughly CIELAB units, instead
+                         of CIELAB. Cheaper to compute; groups can differ slightly.
 
     Returns:
         dict: A dictionary where keys are group names (e.g., "Group 1 (RGB: 255,0,0)")
               and values are lists of the original RGB colors in that group.
     """
-    if not os.path.exists(image_path):
-        raise FileNotFoundError(f"Image file not found: {image_path}")
+    # Load image, resize for performance, and get its RGB pixel data as a NumPy array
+    pixels = _get_thumbnail(image_path).reshape(-1, 3)
 
-    # Load image, resize for performance, and convert to RGB
-    image = Image.open(image_path).convert('RGB')
-    image.thumbnail((150, 150))
-
-    # Get pixel data as a NumPy array
-    pixels = np.array(image)
-    pixels = pixels.reshape(-1, 3)
+    # sklearn and skimage are slow to import, so only pay for them when grouping
+    from sklearn.cluster import DBSCAN
+    if not fast_lab:
+        from skimage.color import lab2rgb
 
     # Avoid clustering if the image is tiny or has few colors
     if len(pixels) < 50:
-        unique_colors = list(set(map(tuple, pixels)))
-        return {"Group 1": unique_colors}
+        return {"Group 1": _unique_colors_by_brightness(pixels)}
+
+    # A thumbnail repeats the same few colors many times, so cluster each distinct
+    # color once and weight it by how many pixels have it; DBSCAN then sees the
+    # same densities as it would with every pixel
+    colors, color_counts = _unique_rgb(pixels, return_counts=True)
 
     # Convert RGB pixel data to LAB color space for perceptually uniform clustering
     # Normalize RGB values to be between 0 and 1 for the conversion
-    lab_pixels = rgb2lab(pixels / 255.0)
+    if fast_lab:
+        lab_colors = _rgb_to_oklab(colors)
+    else:
+        lab_colors = _rgb_to_cielab(colors)
 
     # Calculate min_samples based on a percentage of the total pixels
     # This makes the clustering more robust to different image sizes
     min_samples = max(5, int(len(pixels) * (min_samples_pct / 100.0)))
 
     # Perform DBSCAN clustering. n_jobs=-1 uses all available CPU cores.
-    db = DBSCAN(eps=eps, min_samples=min_samples, metric='euclidean', n_jobs=-1).fit(lab_pixels)
-    
-    # Get the set of unique labels (each unique label is a cluster)
-    unique_labels = set(db.labels_)
-    
-    # --- Group original RGB pixels based on the cluster labels ---
-    grouped_colors = defaultdict(list)
-    # The label -1 is for "noise" points that don't belong to any cluster
-    noise_colors = []
-
-    for i, label in enumerate(db.labels_):
-        original_rgb_color = tuple(pixels[i])
-        if label == -1:
-            noise_colors.append(original_rgb_color)
-        else:
-            grouped_colors[label].append(original_rgb_color)
+    # float32 is plenty at eps-sized distances and halves the data the neighbor
+    # search reads; the group averages below keep the full-precision LAB values.
+    # A ball tree answers the eps-radius queries faster than the k-d tree sklearn
+    # picks by default for dense 3-D color clouds, with identical labels
+    db = DBSCAN(eps=eps, min_samples=min_samples, metric='euclidean', algorithm='ball_tree', n_jobs=-1).fit(
+        lab_colors.astype(np.float32), sample_weight=color_counts
+    )
     
+    labels = db.labels_
+    # The label -1 is for "noise" colors that don't belong to any cluster
+    clustered = labels >= 0
+
     # --- Process the found clusters ---
     final_groups = {}
     
+    # Per-cluster pixel counts and LAB sums in one pass over the clustered colors
+    cluster_ids = labels[clustered]
+    cluster_weights = color_counts[clustered]
+    num_clusters = cluster_ids.max() + 1 if cluster_ids.size else 0
+    cluster_sizes = np.bincount(cluster_ids, weights=cluster_weights, minlength=num_clusters)
+    lab_sums = np.stack([
+        np.bincount(cluster_ids, weights=lab_colors[clustered, channel] * cluster_weights, minlength=num_clusters)
+        for channel in range(3)
+    ], axis=1)
+
+    # Calculate the average color of every group to create representative names
+    # We average the LAB values and convert them all back to RGB at once for accuracy
+    avg_lab_colors = lab_sums / cluster_sizes[:, None]
+    to_rgb = _oklab_to_rgb if fast_lab else lab2rgb
+    avg_rgb_colors = (to_rgb(avg_lab_colors.reshape(-1, 1, 3)).reshape(-1, 3) * 255).astype(int)
+
+    # Group the clustered colors by label once instead of masking per cluster
+    cluster_order = np.argsort(cluster_ids, kind='stable')
+    colors_per_cluster = np.bincount(cluster_ids, minlength=num_clusters)
+    cluster_colors = np.split(colors[clustered][cluster_order], np.cumsum(colors_per_cluster)[:-1])
+
     # Sort clusters by size (number of pixels) to give them stable names
-    sorted_labels = sorted(grouped_colors.keys(), key=lambda k: len(grouped_colors[k]), reverse=True)
+    sorted_labels = np.argsort(-cluster_sizes, kind='stable')
     
-    group_counter = 1
-    for label in sorted_labels:
-        cluster_pixels = grouped_colors[label]
-        
-        # Calculate the average color of the group to create a representative name
-        # We average the LAB values and convert back to RGB for accuracy
-        lab_cluster_pixels = rgb2lab(np.array(cluster_pixels) / 255.0)
-        avg_lab_color = np.mean(lab_cluster_pixels, axis=0)
-        # Reshape for lab2rgb and convert back
-        avg_rgb_color_float = lab2rgb(avg_lab_color.reshape(1, 1, 3))
-        avg_rgb_color = (avg_rgb_color_float[0][0] * 255).astype(int)
-        r, g, b = avg_rgb_color
+    for group_counter, label in enumerate(sorted_labels, start=1):
+        r, g, b = avg_rgb_colors[label]
         
         # Create a descriptive group name and store the unique colors
         group_name = f"Group {group_counter} (RGB: {r},{g},{b})"
-        unique_colors_in_group = sorted(list(set(cluster_pixels)), key=lambda c: sum(int(x) for x in c))
-        final_groups[group_name] = unique_colors_in_group
-        group_counter += 1
+        final_groups[group_name] = _unique_colors_by_brightness(cluster_colors[label])
         
     # Add the "noise" pixels as their own group if they exist
-    if noise_colors:
-        unique_noise_colors = sorted(list(set(noise_colors)), key=lambda c: sum(int(x) for x in c))
-        final_groups["Other Colors"] = unique_noise_colors
+    if not clustered.all():
+        final_groups["Other Colors"] = _unique_colors_by_brightness(colors[~clustered])
 
     return final_groups
 
+def _unique_colors_by_brightness(pixels):
+    """
+    Returns the unique colors of an (N, 3) uint8 pixel array as RGB tuples,
+    ordered by the sum of their channels.
+    """
+    unique_colors = _unique_rgb(pixels)
+    order = np.argsort(unique_colors.sum(axis=1, dtype=np.int32), kind='stable')
+    return [tuple(c) for c in unique_colors[order].tolist()]
+
 def colors_are_similar(color1, color2, tolerance=0):
     """
     Checks if two RGB colors are similar within a given tolerance.
@@ -122,6 +258,34 @@ def colors_are_similar(color1, color2, tolerance=0):
             abs(int(g1) - int(g2)) <= tolerance and
             abs(int(b1) - int(b2)) <= tolerance)
 
+def colors_within_tolerance(pixels, palette, tolerance=0):
+    """
+    Vectorized form of colors_are_similar.
+
+    Checks every pixel of an (..., 3) array against every color of an (N, 3)
+    palette. Each color becomes a per-channel [low, high] range clipped to
+    0-255, so the test is two uint8 comparisons into reused boolean buffers
+    instead of a widened int16 difference per pixel and color.
+
+    Returns:
+        np.ndarray: Boolean array of shape pixels.shape[:-1], True where the pixel
+                    is within `tolerance` of at least one palette color on every channel.
+    """
+    pixels = np.asarray(pixels)[..., :3]
+    palette = np.asarray(palette, dtype=np.int16).reshape(-1, 3)
+    lows = np.clip(palette - tolerance, 0, 255).astype(np.uint8)
+    highs = np.clip(palette + tolerance, 0, 255).astype(np.uint8)
+
+    mask = np.zeros(pixels.shape[:-1], dtype=bool)
+    inside = np.empty(pixels.shape, dtype=bool)
+    not_above = np.empty(pixels.shape, dtype=bool)
+    for low, high in zip(lows, highs):
+        np.greater_equal(pixels, low, out=inside)
+        np.less_equal(pixels, high, out=not_above)
+        inside &= not_above
+        mask |= inside.all(axis=-1)
+    return mask
+
 def extract_common_colors(image_path, num_colors=5, tolerance=25):
     """
     Extracts the most visually distinct common colors from an image.
@@ -139,88 +303,160 @@ def extract_common_colors(image_path, num_colors=5, tolerance=25):
     Returns:
         list: A list of the most common, visually distinct colors as RGB tuples.
     """
-    if not os.path.exists(image_path):
-        raise FileNotFoundError(f"Image file not found: {image_path}")
-
-    # Load image and convert to RGB
-    image = Image.open(image_path).convert('RGB')
+    # Load image and resize for performance, without blending in colors that aren't in the image
+    image = Image.fromarray(_get_thumbnail(image_path))
 
-    # Resize for performance
-    image.thumbnail((150, 150))
-
-    # Get pixel data and find unique colors sorted by frequency
-    pixels = np.array(image)
-    pixels = pixels.reshape(-1, 3)
-    unique_colors, counts = np.unique(pixels, axis=0, return_counts=True)
+    # Find unique colors and their counts with PIL's C color histogram; a dithered
+    # image uses only a few colors, so this is much cheaper than a row-wise np.unique
+    color_counts = image.getcolors(maxcolors=image.width * image.height)
+    counts = np.array([count for count, _ in color_counts])
+    unique_colors = np.array([color for _, color in color_counts], dtype=np.uint8).reshape(-1, 3)
     
-    # Create a list of all unique colors, sorted by frequency
-    sorted_indices = np.argsort(-counts)
-    frequent_colors = [tuple(c) for c in unique_colors[sorted_indices]]
+    # Create an array of all unique colors, sorted by frequency (ties in RGB order),
+    # widened once for the distance checks below
+    sorted_indices = np.lexsort((unique_colors[:, 2], unique_colors[:, 1], unique_colors[:, 0], -counts))
+    frequent_colors = unique_colors[sorted_indices].astype(np.int16)
 
     # --- New Logic to find DISTINCT colors ---
-    distinct_colors = []
-    if not frequent_colors:
+    if len(frequent_colors) == 0:
         return []
 
-    # Always add the single most frequent color to start our list
-    distinct_colors.append(frequent_colors[0])
-
-    # Iterate through the rest of the frequent colors
-    for color in frequent_colors[1:]:
-        # Stop when we have found enough distinct colors
-        if len(distinct_colors) >= num_colors:
-            break
+    # Greedy selection, driven by the chosen colors rather than the candidates: the
+    # next distinct color is always the most frequent one not yet ruled out, and
+    # choosing it rules out every candidate similar to it (L-infinity distance) in
+    # one broadcast. This takes num_colors NumPy passes instead of a Python
+    # iteration per frequent color. Always start with the single most frequent color.
+    remaining = np.ones(len(frequent_colors), dtype=bool)
+    chosen = []
+    while remaining.any() and len(chosen) < max(num_colors, 1):
+        index = int(np.argmax(remaining))
+        chosen.append(index)
+        remaining &= np.abs(frequent_colors - frequent_colors[index]).max(axis=1) > tolerance
+        remaining[index] = False
 
-        # Check if this color is similar to any color we've already selected
-        is_similar_to_an_existing_color = False
-        for selected_color in distinct_colors:
-            if colors_are_similar(color, selected_color, tolerance):
-                is_similar_to_an_existing_color = True
-                break # It's similar, no need to check the others
+    return [tuple(c) for c in frequent_colors[chosen].tolist()]
 
-        # If it's not similar to any of our chosen colors, it's a new distinct color
-        if not is_similar_to_an_existing_color:
-            distinct_colors.append(color)
-
-    return distinct_colors
-
-def split_image_into_chunks(image_path, output_folder):
+def split_image_into_chunks(image_path, output_folder, chunk_format='png'):
     """
     Splits an image into smaller chunks and saves them to the specified folder.
     
     Args:
         image_path (str): Path to the source image
         output_folder (str): Folder to save the chunks in
+        chunk_format (str): 'png' writes one chunk_<i>.png per chunk; 'npy' writes
+                            all chunks as a single chunks.npy array (see load_chunk)
         
     Returns:
         tuple: (num_chunks_x, num_chunks_y, total_chunks)
     """
-    if not os.path.exists(image_path):
-        raise FileNotFoundError(f"Image file not found: {image_path}")
-        
+    # Load image fully up front so the worker threads only read decoded pixels
+    image = _open_image(image_path)
+    image.load()
+
     # Create output folder
     os.makedirs(output_folder, exist_ok=True)
     
-    # Load image
-    image = Image.open(image_path)
     img_w, img_h = image.size
     
     # Calculate grid dimensions
     num_chunks_x = (img_w + CHUNK_SIZE - 1) // CHUNK_SIZE
     num_chunks_y = (img_h + CHUNK_SIZE - 1) // CHUNK_SIZE
     total_chunks = num_chunks_x * num_chunks_y
+
+    # The folder stops describing any source until this split is complete
+    marker_path = os.path.join(output_folder, _SPLIT_MARKER_NAME)
+    try:
+        os.remove(marker_path)
+    except FileNotFoundError:
+        pass
+
+    if chunk_format == 'npy':
+        _save_chunk_array(image, output_folder, num_chunks_x, num_chunks_y)
+    else:
+        _save_chunk_pngs(image, output_folder)
+
+    # Written last, so a marker means every chunk of this source is on disk
+    with open(marker_path, 'w') as f:
+        json.dump(_split_signature(image_path, chunk_format), f)
     
-    # Split and save chunks
-    chunk_index = 0
+    return num_chunks_x, num_chunks_y, total_chunks
+
+def _save_chunk_pngs(image, output_folder):
+    """Saves every chunk of an image as chunk_<i>.png, in index order."""
+    img_w, img_h = image.size
+    # Collect the crop box and output path of every chunk, in index order
+    tasks = []
     for y in range(0, img_h, CHUNK_SIZE):
         for x in range(0, img_w, CHUNK_SIZE):
             chunk_box = (x, y, x + CHUNK_SIZE, y + CHUNK_SIZE)
-            chunk_img = image.crop(chunk_box)
-            chunk_path = os.path.join(output_folder, f"chunk_{chunk_index}.png")
-            chunk_img.save(chunk_path)
-            chunk_index += 1
-    
-    return num_chunks_x, num_chunks_y, total_chunks
+            chunk_path = os.path.join(output_folder, f"chunk_{len(tasks)}.png")
+            tasks.append((chunk_box, chunk_path))
+
+    def save_chunk(task):
+        chunk_box, chunk_path = task
+        # Image.fromarray on a NumPy view would have to copy the non-contiguous tile
+        # anyway and measures slower than crop() for tiles this small; crop() also
+        # pads edge chunks to full size in the image's own mode.
+        # The chunks are intermediate files, so favor encoding speed over size
+        image.crop(chunk_box).save(chunk_path, compress_level=1)
+
+    # PNG encoding releases the GIL, so the chunks encode in parallel
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        list(executor.map(save_chunk, tasks))
+
+_SPLIT_MARKER_NAME = "split_source.json"  # Records which source a chunk folder was split from
+
+def _split_signature(image_path, chunk_format):
+    """Identifies a source image version and the split settings applied to it."""
+    stat = os.stat(image_path)
+    return {
+        'source': os.path.abspath(image_path),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'chunk_size': CHUNK_SIZE,
+        'chunk_format': chunk_format,
+    }
+
+_CHUNK_ARRAY_NAME = "chunks.npy"  # File holding every chunk of an 'npy' split
+
+def _save_chunk_array(image, output_folder, num_chunks_x, num_chunks_y):
+    """
+    Saves every chunk of an image into one (total_chunks, CHUNK_SIZE, CHUNK_SIZE,
+    channels) uint8 array, in the same index order and with the same black edge
+    padding as the PNG chunks. One uncompressed file instead of one PNG per chunk.
+    """
+    has_alpha = 'A' in image.getbands() or 'transparency' in image.info
+    pixels = np.asarray(image.convert('RGBA' if has_alpha else 'RGB'))
+    img_h, img_w, channels = pixels.shape
+
+    # Pad to whole chunks, then regroup the rows and columns into chunk tiles
+    padded = np.pad(pixels, (
+        (0, num_chunks_y * CHUNK_SIZE - img_h),
+        (0, num_chunks_x * CHUNK_SIZE - img_w),
+        (0, 0),
+    ))
+    tiles = padded.reshape(num_chunks_y, CHUNK_SIZE, num_chunks_x, CHUNK_SIZE, channels).swapaxes(1, 2)
+    # Written under a temporary name and swapped in, so a reader never sees a
+    # half-written array
+    array_path = os.path.join(output_folder, _CHUNK_ARRAY_NAME)
+    with open(array_path + ".tmp", 'wb') as f:
+        np.save(f, tiles.reshape(-1, CHUNK_SIZE, CHUNK_SIZE, channels))
+    os.replace(array_path + ".tmp", array_path)
+
+def load_chunk(output_folder, chunk_index):
+    """
+    Loads one chunk saved by split_image_into_chunks(..., chunk_format='npy').
+
+    Args:
+        output_folder (str): Folder the chunks were saved in
+        chunk_index (int): Index of the chunk, as in chunk_<i>.png
+
+    Returns:
+        PIL.Image.Image: The chunk image
+    """
+    # Memory-mapped, so only the requested chunk is read from disk
+    chunks = np.load(os.path.join(output_folder, _CHUNK_ARRAY_NAME), mmap_mode='r')
+    return Image.fromarray(np.array(chunks[chunk_index]))
 
 def get_chunk_info(image_path):
     """
@@ -232,10 +468,7 @@ def get_chunk_info(image_path):
     Returns:
         tuple: (num_chunks_x, num_chunks_y, total_chunks)
     """
-    if not os.path.exists(image_path):
-        raise FileNotFoundError(f"Image file not found: {image_path}")
-        
-    image = Image.open(image_path)
+    image = _open_image(image_path)
     img_w, img_h = image.size
     
     num_chunks_x = (img_w + CHUNK_SIZE - 1) // CHUNK_SIZE
@@ -244,20 +477,53 @@ def get_chunk_info(image_path):
     
     return num_chunks_x, num_chunks_y, total_chunks
 
-def count_existing_chunks(output_folder):
+def count_existing_chunks(output_folder, chunk_format='png'):
     """
-    Counts the number of existing chunk files in a folder.
+    Counts the number of existing chunks in a folder.
     
     Args:
         output_folder (str): Folder containing chunk files
+        chunk_format (str): 'png' counts chunk_<i>.png files; 'npy' reads the
+                            chunk count from the chunks.npy header
         
     Returns:
-        int: Number of chunk files found
+        int: Number of chunks found
     """
-    if not os.path.exists(output_folder):
+    if chunk_format == 'npy':
+        # Memory-mapped, so only the array header is read
+        try:
+            return len(np.load(os.path.join(output_folder, _CHUNK_ARRAY_NAME), mmap_mode='r'))
+        except (OSError, ValueError):
+            return 0
+
+    # One pass over the directory entries, without building a list of paths;
+    # a folder that doesn't exist yet simply has no chunks
+    try:
+        with os.scandir(output_folder) as entries:
+            return sum(1 for entry in entries if entry.name.startswith("chunk_") and entry.name.endswith(".png"))
+    except FileNotFoundError:
         return 0
-        
-    import glob
-    search_path = os.path.join(output_folder, "chunk_*.png")
-    files = glob.glob(search_path)
-    return len(files) 
\ No newline at end of file
+
+def chunks_up_to_date(image_path, output_folder, total_chunks, chunk_format='png'):
+    """
+    Checks whether a previous split of the image can be reused.
+
+    Args:
+        image_path (str): Path to the source image
+        output_folder (str): Folder the chunks were saved in
+        total_chunks (int): Number of chunks the image splits into
+        chunk_format (str): Format the split was saved in, as for split_image_into_chunks
+
+    Returns:
+        bool: True if the folder holds a finished split of this exact file version
+    """
+    # The marker names the source path, size and mtime, so another image with
+    # the same file name (and so the same chunk folder) is never mistaken for it
+    try:
+        with open(os.path.join(output_folder, _SPLIT_MARKER_NAME)) as f:
+            marker = json.load(f)
+        if marker != _split_signature(image_path, chunk_format):
+            return False
+    except (OSError, ValueError):
+        return False
+    return count_existing_chunks(output_folder, chunk_format) == total_chunks
@@ -1,14 +1,121 @@
+import threading
 import tkinter as tk
-from PIL import Image, ImageTk
-import win32gui
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageColor, ImageDraw, ImageTk
+import numpy as np
 
 from config import (
     CHUNK_SIZE, DEFAULT_ALPHA, DEFAULT_SCALE, CALIBRATED_SCALE,
     GRID_COLOR_FULL, GRID_COLOR_PIXEL, HIGHLIGHT_COLOR, TRANSPARENT_COLOR, SUCCESS_COLOR,
-    DEFAULT_WINDOW_X, DEFAULT_WINDOW_Y, MIN_SCALE, MAX_SCALE, MIN_ALPHA, MAX_ALPHA
+    DEFAULT_WINDOW_X, DEFAULT_WINDOW_Y, MIN_SCALE, MAX_SCALE, MIN_ALPHA, MAX_ALPHA,
+    CHUNK_PREWARM_AHEAD, CHUNK_CACHE_BUDGET_BYTES, FULL_IMAGE_CACHE_BUDGET_BYTES
 )
-from win_utils import set_clickthrough
-from image_utils import colors_are_similar
+from win_utils import set_clickthrough, forget_window
+from image_utils import colors_within_tolerance
+
+_FULL_IMAGE_CACHE_SIZE = 4  # Resized full images kept for recently used scales
+_GRID_DASH = (2, 4)  # On/off run lengths in pixels of the dashed chunk grid
+
+
+def _palette_index(image, rgb):
+    """Returns the index of an RGB color in a 'P' image's palette, or None."""
+    palette = image.getpalette() or []
+    for i in range(len(palette) // 3):
+        if tuple(palette[3 * i:3 * i + 3]) == rgb:
+            return i
+    return None
+
+
+def _to_exact_palette(image, extra_color):
+    """
+    Returns an RGB image as a 'P' image whose palette holds exactly its colors
+    followed by extra_color, or None if it has too many colors for a palette.
+    """
+    if image.mode != 'RGB':
+        return None
+    colors = image.getcolors(255)  # One entry stays free for extra_color
+    if colors is None:
+        return None
+    # Map each pixel to its color's index by searching the sorted 24-bit keys;
+    # the keys are unique, so the lookup is exact where quantize() can drift
+    keys = np.array([(r << 16) | (g << 8) | b for _, (r, g, b) in colors], dtype=np.uint32)
+    order = np.argsort(keys)
+    arr = np.asarray(image).astype(np.uint32)
+    pixels = (arr[..., 0] << 16) | (arr[..., 1] << 8) | arr[..., 2]
+    indices = order[np.searchsorted(keys[order], pixels)].astype(np.uint8)
+    paletted = Image.fromarray(indices)  # 2-D uint8 gives an 'L' image; putpalette makes it 'P'
+    paletted.putpalette([c for _, rgb in colors for c in rgb] + list(ImageColor.getrgb(extra_color)))
+    return paletted
+
+
+def _highlight_overlay(mask, size, fill, outline=(255, 0, 0)):
+    """
+    Returns an RGBA image of the given size with every True cell of mask enlarged,
+    filled and outlined as a 1px-bordered rectangle, and transparent elsewhere.
+    """
+    w, h = size
+    mask_h, mask_w = mask.shape
+    # The source cell under each output pixel, sampled at pixel centers like NEAREST
+    xi = np.minimum(((np.arange(w) + 0.5) * mask_w / w).astype(np.intp), mask_w - 1)
+    yi = np.minimum(((np.arange(h) + 0.5) * mask_h / h).astype(np.intp), mask_h - 1)
+    cells = mask[yi[:, None], xi]
+
+    def cell_edges(index):
+        # True on the first and last output pixel of every cell
+        edges = np.ones(len(index), dtype=bool)
+        changes = index[1:] != index[:-1]
+        edges[1:-1] = changes[:-1] | changes[1:]
+        return edges
+
+    border = cells & (cell_edges(yi)[:, None] | cell_edges(xi))
+    overlay = np.zeros((h, w, 4), dtype=np.uint8)
+    overlay[cells] = (*fill[:3], 255)
+    overlay[border] = (*outline, 255)
+    return Image.fromarray(overlay)
+
+
+def _photo_mode(image):
+    """Returns the mode ImageTk.PhotoImage stores an image in."""
+    if image.mode in ('1', 'L', 'RGB', 'RGBA'):
+        return image.mode
+    return Image.getmodebase(image.mode)
+
+
+def _image_nbytes(image):
+    """Returns the size of an image's pixel data in bytes."""
+    return image.width * image.height * len(image.getbands())
+
+def _photo_nbytes(size):
+    """Returns the memory Tk uses for a photo image of `size`, at 4 bytes a pixel."""
+    return size[0] * size[1] * 4
+
+
+def _bake_grid(image, xs, ys, color, dash=None):
+    """
+    Paints grid lines into the image and returns it: vertical lines at columns xs
+    and horizontal lines at rows ys, dashed as (on, off) if given. The image is
+    painted in place unless it must be converted first, which is any mode other
+    than RGB, RGBA, or 'P' with the grid color already in its palette.
+    """
+    ink = _palette_index(image, ImageColor.getrgb(color)) if image.mode == 'P' else None
+    if ink is None:
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA')
+        ink = ImageColor.getcolor(color, image.mode)
+    w, h = image.size
+    # Each line is a one pixel wide paste(), which writes straight into the image;
+    # dashes come from a mask holding the on/off pattern, built once per bake
+    v_mask = h_mask = None
+    if dash:
+        on, off = dash
+        pattern = np.where(np.arange(max(w, h)) % (on + off) < on, 255, 0).astype(np.uint8)
+        v_mask = Image.fromarray(pattern[:h, None])
+        h_mask = Image.fromarray(pattern[None, :w])
+    for x in xs.tolist():
+        image.paste(ink, (x, 0, x + 1, h), v_mask)
+    for y in ys.tolist():
+        image.paste(ink, (0, y, w, y + 1), h_mask)
+    return image
 
 class ImageWindow(tk.Toplevel):
     """
@@ -18,19 +125,41 @@ class ImageWindow(tk.Toplevel):
     def __init__(self, master, original_image, num_chunks_x, num_chunks_y):
         super().__init__(master)
         self.original_pil_image = original_image
+        self._rgb_array = None  # RGB pixels of the image for color matching, built on first use
         self.num_chunks_x = num_chunks_x
         self.num_chunks_y = num_chunks_y
 
         # Window state
         self.alpha = DEFAULT_ALPHA
+        self._alpha_after_id = None  # Pending retry of an alpha set before the window handle exists
         self.scale_factor = DEFAULT_SCALE
         self.clickthrough_mode = False
         self.single_chunk_mode = False
         self.current_chunk_index = 0
         self.calibrated_scale = CALIBRATED_SCALE  # Default
+        self._suspend_redraw = False  # Set while a method makes several changes that end in one redraw
+        self._last_render_state = None  # What the canvas shows; None forces the next redraw
+        # Canvas items kept across redraws and updated in place
+        self._image_item = None
+        self._highlight_item = None
         
         # Image caching for performance
+        # Rendered chunks as PIL images, oldest first; only the chunk on screen is
+        # held as a PhotoImage, since Tk keeps 4 bytes a pixel for each one
         self.chunk_cache = {}
+        self._chunk_cache_bytes = 0
+        self._chunk_photo_index = None  # (index, size) of the chunk self.tk_image currently shows
+        # The chunk PhotoImage is repainted with paste() while chunks keep its size and mode
+        self._chunk_photo = None
+        self._chunk_photo_key = None
+        self._full_image_cache = {}  # (width, height) -> PhotoImage of the whole image, oldest first
+        self._full_image_cache_bytes = 0  # Tk pixel memory held by _full_image_cache
+        # Chunks rendered ahead of navigation on a worker thread, as index -> (size, PIL image);
+        # PhotoImages can only be made on the Tk thread, so they are wrapped on first display
+        self._pil_chunk_cache = {}
+        self._pil_chunk_lock = threading.Lock()
+        self._prewarm_exec = None
+        self._prewarm_gen = 0  # Bumped to make a running prewarm drop its results
 
         # Calibration
         self.target_x = None
@@ -40,18 +169,28 @@ class ImageWindow(tk.Toplevel):
 
         # Highlighting
         self.highlighted_colors = []
+        self.highlighted_colors_np = np.empty((0, 3), dtype=np.uint8)  # Same colors as one (N, 3) array
         self.highlight_rects = []
         self.highlight_tolerance = 0
-        self.success_markers = []
+        self._highlight_photo = None  # Overlay image behind the color highlight item
+        # Success markers are drawn into one transparent layer behind a single item
+        self._success_image = None
+        self._success_photo = None
+        self._success_item = None
+        self._success_flush_id = None
 
         # Image dimensions
         self.original_width, self.original_height = self.original_pil_image.size
         self.img_width = self.original_width
         self.img_height = self.original_height
+        self._build_chunk_table()
         
         # For moving the window
         self._x = 0
         self._y = 0
+        self._move_to = None  # Latest drag position, applied once per idle pass
+        self._move_after_id = None
+        self._last_geom = None  # Last (w, h, x, y) passed to geometry(); w and h may be None
 
         self.setup_window()
         self.create_widgets()
@@ -61,6 +200,8 @@ class ImageWindow(tk.Toplevel):
 
     def initialize_win32(self):
         """Initializes pywin32 properties after the window is created."""
+        # Only the overlay's window handle needs win32gui, so load it on first use
+        import win32gui
         try:
             self.hwnd = win32gui.GetParent(self.winfo_id())
             # First, establish the layered window with alpha but NO clickthrough.
@@ -79,7 +220,7 @@ class ImageWindow(tk.Toplevel):
         """Configures the window properties for a borderless overlay."""
         self.overrideredirect(True)
         self.attributes("-topmost", True)
-        self.geometry(f"+{DEFAULT_WINDOW_X}+{DEFAULT_WINDOW_Y}")
+        self._set_geometry(DEFAULT_WINDOW_X, DEFAULT_WINDOW_Y)
         
         self.config(bg=TRANSPARENT_COLOR)
         self.wm_attributes("-transparentcolor", TRANSPARENT_COLOR)
@@ -103,50 +244,85 @@ class ImageWindow(tk.Toplevel):
 
     def update_display(self):
         """Updates the canvas size and redraws all elements."""
+        if self._suspend_redraw:
+            return
+        # Skip the rebuild when nothing that affects the canvas has changed since
+        # the last one; in full image mode the chunk only moves the highlight
+        view = (
+            self.single_chunk_mode,
+            self.current_chunk_index if self.single_chunk_mode else self.scale_factor,
+            self.calibrated_scale, self.target_x, self.target_y, self.target_w, self.target_h,
+        )
+        highlights = (self.highlighted_colors_np.tobytes(), self.highlight_tolerance)
+        last = self._last_render_state
+        self._last_render_state = (view, highlights)
+        if last is not None and last[0] == view:
+            if last[1] != highlights:
+                # Only the color highlights changed; the image stays as it is
+                self._clear_pixel_items()
+                self.draw_color_highlights()
+            elif not self.single_chunk_mode:
+                self.redraw_highlight_only()
+            return
+
         if self.single_chunk_mode:
             # In single chunk mode, we resize the image to fit the target area,
             # preserving aspect ratio, and then size the window and canvas to match.
             chunk_w, chunk_h = self.get_current_chunk_size()
+            self.img_width, self.img_height = self._fit_chunk_size(chunk_w, chunk_h)
 
-            if self.target_w is not None and self.target_h is not None and \
-               self.target_x is not None and self.target_y is not None and \
-               chunk_w > 0 and chunk_h > 0:
-                # Fit the chunk into the target area, preserving aspect ratio
-                scale = min(self.target_w / chunk_w, self.target_h / chunk_h)
-                self.img_width = int(chunk_w * scale)
-                self.img_height = int(chunk_h * scale)
-                
+            if self._is_calibrated() and chunk_w > 0 and chunk_h > 0:
                 # Center the now smaller window within the original target area
                 win_x = self.target_x + (self.target_w - self.img_width) // 2
                 win_y = self.target_y + (self.target_h - self.img_height) // 2
-                self.geometry(f"{self.img_width}x{self.img_height}+{win_x}+{win_y}")
+                self._set_geometry(win_x, win_y, self.img_width, self.img_height)
             else:
-                # Fallback if not calibrated: use a default scale
-                self.img_width = int(chunk_w * self.calibrated_scale)
-                self.img_height = int(chunk_h * self.calibrated_scale)
-                # Position it at the last known good coordinates or a default
+                # Not calibrated: position it at the last known good coordinates or a default
                 last_x = self.winfo_x()
                 last_y = self.winfo_y()
-                self.geometry(f"{self.img_width}x{self.img_height}+{last_x}+{last_y}")
+                self._set_geometry(last_x, last_y, self.img_width, self.img_height)
         else:
             self.img_width = int(self.original_width * self.scale_factor)
             self.img_height = int(self.original_height * self.scale_factor)
 
         self.canvas.config(width=self.img_width, height=self.img_height)
-        self.canvas.delete("all")
+        # The image and chunk highlight are updated in place; only the per-pixel
+        # items of the previous view are rebuilt
+        self._clear_pixel_items()
         self.draw_canvas_elements()
         self.update_idletasks()
 
+    def _clear_pixel_items(self):
+        """Deletes the color highlight and success marker items of the previous view."""
+        self.canvas.delete("color_highlight")
+        self.highlight_rects.clear()
+        self.clear_success_markers()
+
+    def _is_calibrated(self):
+        """Returns True once a target area has been set by calibration."""
+        return None not in (self.target_x, self.target_y, self.target_w, self.target_h)
+
+    def _fit_chunk_size(self, chunk_w, chunk_h):
+        """Returns the displayed size of a chunk in single chunk mode."""
+        if self._is_calibrated() and chunk_w > 0 and chunk_h > 0:
+            # Fit the chunk into the target area, preserving aspect ratio
+            scale = min(self.target_w / chunk_w, self.target_h / chunk_h)
+        else:
+            # Fallback if not calibrated: use a default scale
+            scale = self.calibrated_scale
+        return int(chunk_w * scale), int(chunk_h * scale)
+
     def draw_canvas_elements(self):
         """Draws the image, grid, and highlight."""
         if self.single_chunk_mode:
             self.draw_single_chunk()
+            # Color highlights only exist in single chunk mode
+            if self.highlighted_colors:
+                self.draw_color_highlights()
         else:
             self.draw_full_image_with_grid()
         
         self.draw_highlight()
-        if self.highlighted_colors:
-            self.draw_color_highlights()
         self.draw_success_markers()
 
     def draw_single_chunk(self):
@@ -155,34 +331,135 @@ class ImageWindow(tk.Toplevel):
         if chunk_w == 0 or chunk_h == 0:
             return
 
-        # Check cache first
-        if self.current_chunk_index in self.chunk_cache:
-            self.tk_image = self.chunk_cache[self.current_chunk_index]
-        else:
-            # Crop the original image to the current chunk
-            row = self.current_chunk_index // self.num_chunks_x
-            col = self.current_chunk_index % self.num_chunks_x
-            x1 = col * CHUNK_SIZE
-            y1 = row * CHUNK_SIZE
-            x2 = min(x1 + CHUNK_SIZE, self.original_width)
-            y2 = min(y1 + CHUNK_SIZE, self.original_height)
-            chunk_image = self.original_pil_image.crop((x1, y1, x2, y2))
-            
-            # Resize chunk to fit the canvas, which has been pre-sized by update_display
-            if self.img_width <= 0 or self.img_height <= 0:
-                return
-
-            scaled_chunk = chunk_image.resize((self.img_width, self.img_height), Image.Resampling.NEAREST)
-            self.tk_image = ImageTk.PhotoImage(scaled_chunk)
-            # Save to cache
-            self.chunk_cache[self.current_chunk_index] = self.tk_image
+        # Resize chunk to fit the canvas, which has been pre-sized by update_display
+        if self.img_width <= 0 or self.img_height <= 0:
+            return
 
-        # The canvas is the same size as the image, so we draw at the center
-        self.canvas.create_image(self.img_width // 2, self.img_height // 2, anchor='center', image=self.tk_image)
-        
-        # Draw the pixel grid over the image
-        pixel_size = self.img_width / chunk_w
-        self.draw_pixel_grid(0, 0, chunk_w, chunk_h, pixel_size)
+        index = self.current_chunk_index
+        size = (self.img_width, self.img_height)
+        if self._chunk_photo_index != (index, size):
+            # Check cache first; an entry rendered for another size is stale
+            scaled_chunk = self.chunk_cache.pop(index, None)
+            if scaled_chunk is not None:
+                self._chunk_cache_bytes -= _image_nbytes(scaled_chunk)
+                if scaled_chunk.size != size:
+                    scaled_chunk = None
+            if scaled_chunk is None:
+                with self._pil_chunk_lock:
+                    prewarmed = self._pil_chunk_cache.pop(index, None)
+                if prewarmed is not None and prewarmed[0] == size:
+                    scaled_chunk = prewarmed[1]
+                else:
+                    scaled_chunk = self._render_chunk(index, size)
+            self._cache_chunk(index, scaled_chunk)
+            key = (scaled_chunk.size, _photo_mode(scaled_chunk))
+            if self._chunk_photo is not None and key == self._chunk_photo_key:
+                self._chunk_photo.paste(scaled_chunk)
+            else:
+                self.tk_image = self._chunk_photo = None  # Release the old Tk pixels first
+                self._chunk_photo = ImageTk.PhotoImage(scaled_chunk)
+                self._chunk_photo_key = key
+            self.tk_image = self._chunk_photo
+            self._chunk_photo_index = (index, size)
+
+        # The canvas is the same size as the image, so it fills it from the corner
+        self._show_image()
+        self._schedule_prewarm()
+
+    def _cache_chunk(self, index, scaled_chunk):
+        """Stores a rendered chunk as most recently used, evicting old ones past the budget."""
+        self.chunk_cache[index] = scaled_chunk
+        self._chunk_cache_bytes += _image_nbytes(scaled_chunk)
+        while self._chunk_cache_bytes > CHUNK_CACHE_BUDGET_BYTES and len(self.chunk_cache) > 1:
+            oldest = next(iter(self.chunk_cache))
+            self._chunk_cache_bytes -= _image_nbytes(self.chunk_cache.pop(oldest))
+
+    def _build_chunk_table(self):
+        """Precomputes the (x1, y1, x2, y2) box of every chunk, in chunk index order."""
+        cols = [(x, min(x + CHUNK_SIZE, self.original_width))
+                for x in range(0, self.num_chunks_x * CHUNK_SIZE, CHUNK_SIZE)]
+        rows = [(y, min(y + CHUNK_SIZE, self.original_height))
+                for y in range(0, self.num_chunks_y * CHUNK_SIZE, CHUNK_SIZE)]
+        self._chunk_table = [(x1, y1, x2, y2) for y1, y2 in rows for x1, x2 in cols]
+
+    def _evict_stale_chunks(self):
+        """Drops cached and prewarmed chunks that were rendered for another display size."""
+        def stale(index, image):
+            x1, y1, x2, y2 = self._chunk_bounds(index)
+            return image.size != self._fit_chunk_size(x2 - x1, y2 - y1)
+
+        for index in [i for i, image in self.chunk_cache.items() if stale(i, image)]:
+            self._chunk_cache_bytes -= _image_nbytes(self.chunk_cache.pop(index))
+        with self._pil_chunk_lock:
+            for index in [i for i, (_, image) in self._pil_chunk_cache.items() if stale(i, image)]:
+                del self._pil_chunk_cache[index]
+
+    def _chunk_bounds(self, index):
+        """Returns the (x1, y1, x2, y2) box of a chunk in original image pixels."""
+        return self._chunk_table[index]
+
+    def _render_chunk(self, index, size):
+        """Crops a chunk and enlarges it to size with its pixel grid; safe to run off the Tk thread."""
+        x1, y1, x2, y2 = self._chunk_bounds(index)
+        chunk_image = self.original_pil_image.crop((x1, y1, x2, y2))
+        # Chunks of pixel art rarely use more than a few colors; as 'P' images
+        # they cost 1 byte a pixel in the caches instead of 4
+        paletted = _to_exact_palette(chunk_image, GRID_COLOR_PIXEL)
+        if paletted is not None:
+            chunk_image = paletted
+        # PIL's NEAREST resize beats np.repeat here even at whole-number scales,
+        # so it is used for every scale
+        scaled_chunk = chunk_image.resize(size, Image.Resampling.NEAREST)
+        # The pixel grid is painted into the image, so cached chunks carry it
+        return self.draw_pixel_grid(scaled_chunk, x2 - x1, y2 - y1)
+
+    def _schedule_prewarm(self):
+        """Renders the chunks around the current one on a worker thread."""
+        total = self.num_chunks_x * self.num_chunks_y
+        start = max(0, self.current_chunk_index - 1)
+        stop = min(total, self.current_chunk_index + CHUNK_PREWARM_AHEAD + 1)
+        plan = []
+        for index in range(start, stop):
+            if index in self.chunk_cache:
+                continue
+            x1, y1, x2, y2 = self._chunk_bounds(index)
+            size = self._fit_chunk_size(x2 - x1, y2 - y1)
+            if size[0] > 0 and size[1] > 0:
+                plan.append((index, size))
+
+        wanted = {index for index, _ in plan}
+        with self._pil_chunk_lock:
+            # Drop chunks rendered for a part of the image that is no longer near
+            for index in [i for i in self._pil_chunk_cache if i not in wanted]:
+                del self._pil_chunk_cache[index]
+            self._prewarm_gen += 1
+            gen = self._prewarm_gen
+        if not plan:
+            return
+        if self._prewarm_exec is None:
+            self._prewarm_exec = ThreadPoolExecutor(max_workers=1)
+        self._prewarm_exec.submit(self._prewarm_chunks, gen, plan)
+
+    def _prewarm_chunks(self, gen, plan):
+        """Worker: renders the planned chunks until a newer plan replaces this one."""
+        for index, size in plan:
+            with self._pil_chunk_lock:
+                if gen != self._prewarm_gen:
+                    return
+                cached = self._pil_chunk_cache.get(index)
+            if cached is not None and cached[0] == size:
+                continue
+            scaled_chunk = self._render_chunk(index, size)
+            with self._pil_chunk_lock:
+                if gen != self._prewarm_gen:
+                    return
+                self._pil_chunk_cache[index] = (size, scaled_chunk)
+
+    def _cancel_prewarm(self):
+        """Stops a running prewarm and drops the chunks it rendered."""
+        with self._pil_chunk_lock:
+            self._prewarm_gen += 1
+            self._pil_chunk_cache.clear()
 
     def draw_color_highlights(self):
         """Highlights pixels of specific colors."""
@@ -193,93 +470,124 @@ class ImageWindow(tk.Toplevel):
         if chunk_w == 0 or chunk_h == 0:
             return
             
-        row = self.current_chunk_index // self.num_chunks_x
-        col = self.current_chunk_index % self.num_chunks_x
-        x1 = col * CHUNK_SIZE
-        y1 = row * CHUNK_SIZE
-        x2 = min(x1 + CHUNK_SIZE, self.original_width)
-        y2 = min(y1 + CHUNK_SIZE, self.original_height)
-        
-        chunk_image = self.original_pil_image.crop((x1, y1, x2, y2)).convert("RGB")
-        pixel_data = chunk_image.load()
-        
-        pixel_size = self.img_width / chunk_w
-        
-        # The primary color for filling is the first one in the list
-        r_fill, g_fill, b_fill = self.highlighted_colors[0]
+        mask = self._chunk_color_mask(self.highlighted_colors_np)
+        if self.img_width <= 0 or self.img_height <= 0 or not mask.any():
+            return
         
-        for y_local in range(chunk_h):
-            for x_local in range(chunk_w):
-                r, g, b = pixel_data[x_local, y_local]
-                
-                # Check if the pixel matches any of the selected colors
-                for target_color in self.highlighted_colors:
-                    if colors_are_similar((r, g, b), target_color, self.highlight_tolerance):
-                        rx1 = x_local * pixel_size
-                        ry1 = y_local * pixel_size
-                        rx2 = rx1 + pixel_size
-                        ry2 = ry1 + pixel_size
-                        rect = self.canvas.create_rectangle(
-                            rx1, ry1, rx2, ry2, 
-                            fill=f"#{r_fill:02x}{g_fill:02x}{b_fill:02x}", 
-                            outline="red", 
-                            width=1
-                        )
-                        self.highlight_rects.append(rect)
-                        break # Found a match, no need to check other colors
-
-    def draw_pixel_grid(self, img_x, img_y, chunk_w, chunk_h, pixel_size):
-        """Draws a pixel grid on the enlarged chunk."""
-        scaled_w = int(chunk_w * pixel_size)
-        scaled_h = int(chunk_h * pixel_size)
-        for i in range(1, chunk_w):
-            x = img_x + i * pixel_size
-            if x < img_x + scaled_w:
-                self.canvas.create_line(x, img_y, x, img_y + scaled_h, fill=GRID_COLOR_PIXEL, width=1)
-        for i in range(1, chunk_h):
-            y = img_y + i * pixel_size
-            if y < img_y + scaled_h:
-                self.canvas.create_line(img_x, y, img_x + scaled_w, y, fill=GRID_COLOR_PIXEL, width=1)
+        # The primary color for filling is the first one in the list; the matching
+        # cells are painted into one overlay image instead of a rectangle item each
+        overlay = _highlight_overlay(
+            mask, (self.img_width, self.img_height), tuple(self.highlighted_colors[0])
+        )
+        photo = self._highlight_photo
+        if photo is not None and (photo.width(), photo.height()) == overlay.size:
+            # Same canvas size as last time: repaint the Tk image in place
+            photo.paste(overlay)
+        else:
+            self._highlight_photo = None  # Release the old Tk pixels first
+            self._highlight_photo = ImageTk.PhotoImage(overlay)
+        rect = self.canvas.create_image(
+            0, 0, anchor='nw', image=self._highlight_photo, tags="color_highlight"
+        )
+        self.highlight_rects.append(rect)
+
+    def _chunk_color_mask(self, colors):
+        """
+        Returns a (chunk_h, chunk_w) boolean mask of the current chunk's pixels
+        that match any of the colors within the highlight tolerance.
+        """
+        return colors_within_tolerance(self._chunk_pixels(), colors, self.highlight_tolerance)
+
+    def _chunk_pixels(self):
+        """Returns the current chunk's RGB pixels as a view into the decoded image."""
+        if self._rgb_array is None:
+            # Decoded once per image on first use; each chunk is then a view into it
+            self._rgb_array = np.asarray(self.original_pil_image.convert("RGB"))
+        x1, y1, x2, y2 = self._chunk_bounds(self.current_chunk_index)
+        return self._rgb_array[y1:y2, x1:x2]
+
+    def draw_pixel_grid(self, scaled_chunk, chunk_w, chunk_h):
+        """Returns the enlarged chunk with its pixel grid painted in."""
+        pixel_size = scaled_chunk.width / chunk_w
+        xs = (np.arange(1, chunk_w) * pixel_size).astype(np.intp)
+        ys = (np.arange(1, chunk_h) * pixel_size).astype(np.intp)
+        return _bake_grid(scaled_chunk, xs, ys[ys < scaled_chunk.height], GRID_COLOR_PIXEL)
 
     def draw_full_image_with_grid(self):
         """Draws the full image with the chunk grid."""
-        scaled_image = self.original_pil_image.resize(
-            (self.img_width, self.img_height), 
-            Image.Resampling.NEAREST
-        )
-        self.tk_image = ImageTk.PhotoImage(scaled_image)
-        self.canvas.create_image(0, 0, anchor='nw', image=self.tk_image)
-
-        scaled_chunk_size = CHUNK_SIZE * self.scale_factor
-        for i in range(1, self.num_chunks_x):
-            x = i * scaled_chunk_size
-            self.canvas.create_line(x, 0, x, self.img_height, fill=GRID_COLOR_FULL, dash=(2, 4))
-        for i in range(1, self.num_chunks_y):
-            y = i * scaled_chunk_size
-            self.canvas.create_line(0, y, self.img_width, y, fill=GRID_COLOR_FULL, dash=(2, 4))
+        # The resized image only depends on the output size, so chunk navigation
+        # and repeated scale values reuse the PhotoImage instead of resizing again
+        size = (self.img_width, self.img_height)
+        self.tk_image = self._full_image_cache.pop(size, None)
+        self._chunk_photo_index = None
+        if self.tk_image is not None:
+            self._full_image_cache_bytes -= _photo_nbytes(size)
+        else:
+            scaled_image = self.original_pil_image.resize(size, Image.Resampling.NEAREST)
+            # Paint the dashed chunk grid into the image rather than adding a
+            # canvas line per chunk boundary on every redraw
+            scaled_chunk_size = CHUNK_SIZE * self.scale_factor
+            xs = (np.arange(1, self.num_chunks_x) * scaled_chunk_size).astype(np.intp)
+            ys = (np.arange(1, self.num_chunks_y) * scaled_chunk_size).astype(np.intp)
+            scaled_image = _bake_grid(
+                scaled_image, xs[xs < self.img_width], ys[ys < self.img_height],
+                GRID_COLOR_FULL, dash=_GRID_DASH
+            )
+            self.tk_image = ImageTk.PhotoImage(scaled_image)
+        self._full_image_cache[size] = self.tk_image  # Re-insert as most recently used
+        self._full_image_cache_bytes += _photo_nbytes(size)
+        # Evict the oldest scales past the count or byte budget, keeping the current one
+        while len(self._full_image_cache) > 1 and (
+            len(self._full_image_cache) > _FULL_IMAGE_CACHE_SIZE
+            or self._full_image_cache_bytes > FULL_IMAGE_CACHE_BUDGET_BYTES
+        ):
+            oldest = next(iter(self._full_image_cache))
+            del self._full_image_cache[oldest]
+            self._full_image_cache_bytes -= _photo_nbytes(oldest)
+        self._show_image()
+
+    def _show_image(self):
+        """Points the canvas image item at self.tk_image, creating it on first use."""
+        # Both modes size the canvas to the image, so the item never moves
+        if self._image_item is None:
+            self._image_item = self.canvas.create_image(0, 0, anchor='nw', image=self.tk_image)
+        else:
+            self.canvas.itemconfigure(self._image_item, image=self.tk_image)
 
     def draw_highlight(self):
         """Draws the highlight rectangle over the current chunk."""
         if self.single_chunk_mode:
-            return # No highlight needed when only one chunk is visible
+            # No highlight needed when only one chunk is visible
+            if self._highlight_item is not None:
+                self.canvas.itemconfigure(self._highlight_item, state='hidden')
+            return
 
-        scaled_chunk_w = CHUNK_SIZE * self.scale_factor
-        scaled_chunk_h = CHUNK_SIZE * self.scale_factor
-        
-        row = self.current_chunk_index // self.num_chunks_x
-        col = self.current_chunk_index % self.num_chunks_x
-        
-        x1 = col * scaled_chunk_w
-        y1 = row * scaled_chunk_h
-        x2 = x1 + scaled_chunk_w
-        y2 = y1 + scaled_chunk_h
-        
-        self.canvas.create_rectangle(x1, y1, x2, y2, outline=HIGHLIGHT_COLOR, width=2)
+        if self._highlight_item is None:
+            self._highlight_item = self.canvas.create_rectangle(
+                *self._highlight_coords(), outline=HIGHLIGHT_COLOR, width=2, tags="highlight"
+            )
+        else:
+            self.redraw_highlight_only()
+            self.canvas.itemconfigure(self._highlight_item, state='normal')
+
+    def redraw_highlight_only(self):
+        """Moves the existing highlight rectangle onto the current chunk."""
+        self.canvas.coords("highlight", *self._highlight_coords())
+
+    def _highlight_coords(self):
+        """Returns the canvas rectangle of the current chunk in full image mode."""
+        scaled_chunk_size = CHUNK_SIZE * self.scale_factor
+        x1, y1 = self._chunk_table[self.current_chunk_index][:2]
+        x1 *= self.scale_factor
+        y1 *= self.scale_factor
+        return x1, y1, x1 + scaled_chunk_size, y1 + scaled_chunk_size
         
     # --- Public methods for ControlWindow to call ---
     def highlight_colors(self, colors, tolerance=0):
         """Sets the colors to be highlighted."""
         self.highlighted_colors = colors
+        # Kept as one array too, so every tolerance check broadcasts all colors at once
+        self.highlighted_colors_np = np.array(colors, dtype=np.uint8).reshape(-1, 3)
         self.highlight_tolerance = tolerance
         self.update_display()
 
@@ -288,7 +596,9 @@ class ImageWindow(tk.Toplevel):
         for rect in self.highlight_rects:
             self.canvas.delete(rect)
         self.highlight_rects.clear()
+        self._highlight_photo = None
         self.highlighted_colors = []
+        self.highlighted_colors_np = np.empty((0, 3), dtype=np.uint8)
         
         self.clear_success_markers() # <-- Add this call
         
@@ -299,90 +609,105 @@ class ImageWindow(tk.Toplevel):
     def mark_pixel_as_successful(self, screen_x, screen_y):
         """Draws a visual marker on a successfully drawn pixel."""
         # Convert absolute screen coordinates to local canvas coordinates
-        canvas_x = screen_x - self.winfo_x()
-        canvas_y = screen_y - self.winfo_y()
-
-        # Draw a small, semi-transparent circle or rectangle as a marker
-        # We'll use a 3x3 rectangle for visibility
-        marker = self.canvas.create_rectangle(
-            canvas_x - 1, canvas_y - 1,
-            canvas_x + 1, canvas_y + 1,
-            outline=SUCCESS_COLOR,
-            fill=SUCCESS_COLOR,
-            width=1
+        win_x, win_y = self._window_position()
+        canvas_x = screen_x - win_x
+        canvas_y = screen_y - win_y
+
+        size = (self.img_width, self.img_height)
+        if self._success_image is None or self._success_image.size != size:
+            # First marker of this view (or the canvas was resized): start a new layer
+            self.clear_success_markers()
+            self._success_image = Image.new("RGBA", size, (0, 0, 0, 0))
+            self._success_photo = ImageTk.PhotoImage(self._success_image)
+            self._success_item = self.canvas.create_image(
+                0, 0, anchor='nw', image=self._success_photo, tags="success"
+            )
+
+        # A 3x3 square for visibility, drawn into the layer instead of as an item
+        ImageDraw.Draw(self._success_image).rectangle(
+            (canvas_x - 1, canvas_y - 1, canvas_x + 1, canvas_y + 1),
+            fill=SUCCESS_COLOR, outline=SUCCESS_COLOR
         )
-        self.success_markers.append(marker)
-    
+        # Markers arrive in batches, so the layer is uploaded to Tk once per batch
+        if self._success_flush_id is None:
+            self._success_flush_id = self.after_idle(self._flush_success_markers)
+
+    def _flush_success_markers(self):
+        """Uploads the success marker layer to its photo image."""
+        self._success_flush_id = None
+        if self._success_photo is not None:
+            self._success_photo.paste(self._success_image)
+
     def draw_success_markers(self):
-        """Redraws all success markers (needed if the display updates)."""
-        # This is a placeholder; a more robust implementation might re-calculate
-        # marker positions if the window moves during drawing, but for now,
-        # we assume it's static during the drawing process. The primary
-        # use is to ensure they are drawn on top.
-        for marker in self.success_markers:
-            self.canvas.tag_raise(marker)
+        """Keeps the success markers on top after the display updates."""
+        if self._success_item is not None:
+            self.canvas.tag_raise(self._success_item)
 
     def clear_success_markers(self):
         """Clears all visual success markers from the canvas."""
-        for marker in self.success_markers:
-            self.canvas.delete(marker)
-        self.success_markers.clear()
+        if self._success_flush_id is not None:
+            self.after_cancel(self._success_flush_id)
+            self._success_flush_id = None
+        if self._success_item is not None:
+            self.canvas.delete(self._success_item)
+        self._success_item = None
+        self._success_photo = None
+        self._success_image = None
 
     def get_pixel_locations_for_colors(self, target_colors):
         """
         Gets the absolute screen coordinates for all pixels in the current chunk
         that match any of the target colors.
         """
+        return self.pixel_locator(target_colors)()
+
+    def pixel_locator(self, target_colors):
+        """
+        Prepares a search for the current chunk's pixels matching the target colors.
+
+        Call this on the Tk thread: it places the window and snapshots the chunk,
+        colors and geometry. The returned function does the scan and returns the
+        screen coordinates get_pixel_locations_for_colors would; it touches no Tk
+        state, so the drawing thread can run it without blocking the GUI.
+        """
         if not self.single_chunk_mode or not target_colors:
-            return []
+            return lambda: []
 
-        # Ensure the window is placed correctly before getting locations
+        # Ensure the window is placed correctly before getting locations; this is a
+        # no-op when the view is current, and so is a drag still waiting for idle
         self.update_display()
-        self.update_idletasks()
-        
-        win_x = self.winfo_x()
-        win_y = self.winfo_y()
+        if self._move_after_id is not None:
+            self.after_cancel(self._move_after_id)
+            self._apply_move()
+        win_x, win_y = self._window_position()
 
         chunk_w, chunk_h = self.get_current_chunk_size()
         if chunk_w == 0 or chunk_h == 0:
-            return []
-
-        row = self.current_chunk_index // self.num_chunks_x
-        col = self.current_chunk_index % self.num_chunks_x
-        x1 = col * CHUNK_SIZE
-        y1 = row * CHUNK_SIZE
-        x2 = min(x1 + CHUNK_SIZE, self.original_width)
-        y2 = min(y1 + CHUNK_SIZE, self.original_height)
-        
+            return lambda: []
+
         try:
-            chunk_image = self.original_pil_image.crop((x1, y1, x2, y2)).convert("RGB")
-            pixel_data = chunk_image.load()
+            chunk = self._chunk_pixels()
         except Exception as e:
             print(f"Error getting chunk image data: {e}")
-            return []
+            return lambda: []
+        # Copied so later edits to the caller's color list can't reach the scan
+        palette = np.array(target_colors, dtype=np.uint8).reshape(-1, 3)
+        tolerance = self.highlight_tolerance
 
-        locations = []
         pixel_w = self.img_width / chunk_w
         pixel_h = self.img_height / chunk_h
 
-        for y_local in range(chunk_h):
-            for x_local in range(chunk_w):
-                r, g, b = pixel_data[x_local, y_local]
-                
-                for target_color in target_colors:
-                    if colors_are_similar((r, g, b), target_color, self.highlight_tolerance):
-                        # Calculate center of the scaled pixel on the canvas
-                        canvas_x = x_local * pixel_w + (pixel_w / 2)
-                        canvas_y = y_local * pixel_h + (pixel_h / 2)
-                        
-                        # Convert to absolute screen coordinates
-                        screen_x = win_x + canvas_x
-                        screen_y = win_y + canvas_y
-                        
-                        locations.append((int(screen_x), int(screen_y)))
-                        break # Found a match, move to the next pixel
-
-        return locations
+        def locate():
+            # np.nonzero walks the mask row by row, the order strokes are split in
+            ys, xs = np.nonzero(colors_within_tolerance(chunk, palette, tolerance))
+
+            # Centers of the matching scaled pixels on the canvas, converted to absolute
+            # screen coordinates and truncated like int()
+            screen_x = (win_x + (xs * pixel_w + pixel_w / 2)).astype(np.int64)
+            screen_y = (win_y + (ys * pixel_h + pixel_h / 2)).astype(np.int64)
+            return list(zip(screen_x.tolist(), screen_y.tolist()))
+
+        return locate
 
     def set_alpha(self, value):
         """Sets the window's alpha/opacity."""
@@ -390,11 +715,14 @@ class ImageWindow(tk.Toplevel):
         if hasattr(self, 'hwnd'):
             set_clickthrough(self.hwnd, self.alpha, self.clickthrough_mode)
         else:
-            # If hwnd isn't initialized yet, schedule the alpha update for after initialization
-            self.after(150, lambda: self._apply_alpha_if_ready())
+            # If hwnd isn't initialized yet, schedule the alpha update for after
+            # initialization; a burst of calls shares one retry, which applies the latest value
+            if self._alpha_after_id is None:
+                self._alpha_after_id = self.after(150, self._apply_alpha_if_ready)
 
     def _apply_alpha_if_ready(self):
         """Applies the current alpha value if the window handle is ready."""
+        self._alpha_after_id = None
         if hasattr(self, 'hwnd'):
             set_clickthrough(self.hwnd, self.alpha, self.clickthrough_mode)
 
@@ -404,11 +732,47 @@ class ImageWindow(tk.Toplevel):
 
     def set_chunk(self, index):
         self.current_chunk_index = index
-        self.update_display()
+        # In full image mode only the highlight depends on the chunk, so while
+        # the scale is unchanged the highlight drawn last time can simply move
+        if not self.single_chunk_mode and self._highlight_item is not None:
+            self.redraw_highlight_only()
+        else:
+            self.update_display()
         
     def clear_cache(self):
         """Clears the chunk cache to free memory."""
         self.chunk_cache.clear()
+        self._chunk_cache_bytes = 0
+        self._chunk_photo_index = None
+        self._chunk_photo = None
+        self._chunk_photo_key = None
+        self._last_render_state = None
+
+    def reload(self, original_image, num_chunks_x, num_chunks_y):
+        """Swaps in a new image and chunk grid, keeping the window and its display settings."""
+        self.original_pil_image = original_image
+        self._rgb_array = None
+        self.num_chunks_x = num_chunks_x
+        self.num_chunks_y = num_chunks_y
+        self.current_chunk_index = 0
+        self._cancel_prewarm()
+        self.clear_cache()
+        self._full_image_cache.clear()
+        self._full_image_cache_bytes = 0
+
+        # Highlights and markers belong to the old image
+        self.highlighted_colors = []
+        self.highlighted_colors_np = np.empty((0, 3), dtype=np.uint8)
+        self.highlight_rects.clear()
+        self.clear_success_markers()
+        self.canvas.delete("all")
+        self._image_item = None
+        self._highlight_item = None
+
+        self.original_width, self.original_height = self.original_pil_image.size
+        self.img_width = self.original_width
+        self.img_height = self.original_height
+        self._build_chunk_table()
 
     def toggle_clickthrough(self, enabled):
         self.clickthrough_mode = enabled
@@ -416,14 +780,20 @@ class ImageWindow(tk.Toplevel):
             set_clickthrough(self.hwnd, self.alpha, self.clickthrough_mode)
 
     def toggle_single_chunk(self, enabled):
-        self.single_chunk_mode = enabled
-        if not enabled:
-            self.clear_color_highlight()
+        # Clearing highlights and resetting the scale each redraw on their own,
+        # so hold those back and draw the new mode once at the end
+        self._suspend_redraw = True
+        try:
+            self.single_chunk_mode = enabled
+            self.clear_cache()
+            if not enabled:
+                self.clear_color_highlight()
+                # Reset scale when exiting single chunk mode
+                if self.master:
+                    self.set_scale(self.calibrated_scale)  # Use calibrated scale
+        finally:
+            self._suspend_redraw = False
         self.update_display()
-        self.clear_cache()
-        # Reset scale when exiting single chunk mode
-        if not enabled and self.master:
-            self.set_scale(self.calibrated_scale)  # Use calibrated scale
 
     def set_calibration(self, x, y, w, h):
         """Sets the position and size of the chunk window based on calibration."""
@@ -438,13 +808,14 @@ class ImageWindow(tk.Toplevel):
             scale_x = self.target_w / chunk_w
             scale_y = self.target_h / chunk_h
             self.calibrated_scale = min(scale_x, scale_y)
+        self._evict_stale_chunks()
 
         # Move the window via update_display, which now handles positioning
         if self.single_chunk_mode:
             self.update_display()
         else:
             # If not in single chunk mode, still move the window to the top-left of the target
-             self.geometry(f"+{self.target_x}+{self.target_y}")
+             self._set_geometry(self.target_x, self.target_y)
 
     def start_move(self, event):
         self._x = event.x_root - self.winfo_x()
@@ -453,7 +824,55 @@ class ImageWindow(tk.Toplevel):
     def do_move(self, event):
         x = event.x_root - self._x
         y = event.y_root - self._y
-        self.geometry(f"+{x}+{y}")
+        # Motion events arrive faster than the window can be moved; keep only the
+        # latest position and move once when Tk next goes idle
+        self._move_to = (x, y)
+        if self._move_after_id is None:
+            self._move_after_id = self.after_idle(self._apply_move)
+
+    def _apply_move(self):
+        """Moves the window to the most recent drag position."""
+        self._move_after_id = None
+        self._set_geometry(*self._move_to)
+
+    def _window_position(self):
+        """Returns the window's screen position, from the last placement if there was one."""
+        # The overlay is override-redirect, so no window manager moves it from
+        # where it was last placed; Tk only needs to catch up for winfo_x/y
+        if self._last_geom is not None:
+            return self._last_geom[2:]
+        self.update_idletasks()
+        return self.winfo_x(), self.winfo_y()
+
+    def _set_geometry(self, x, y, w=None, h=None):
+        """Places (and optionally sizes) the window, skipping the Tk call if nothing changed."""
+        geom = (w, h, x, y)
+        if geom == self._last_geom:
+            return
+        self._last_geom = geom
+        if w is None:
+            self.geometry(f"+{x}+{y}")
+        else:
+            self.geometry(f"{w}x{h}+{x}+{y}")
+
+    def destroy(self):
+        """Destroys the window and stops any chunk prewarming or pending move."""
+        self._cancel_prewarm()
+        if self._move_after_id is not None:
+            self.after_cancel(self._move_after_id)
+            self._move_after_id = None
+        if self._success_flush_id is not None:
+            self.after_cancel(self._success_flush_id)
+            self._success_flush_id = None
+        if self._alpha_after_id is not None:
+            self.after_cancel(self._alpha_after_id)
+            self._alpha_after_id = None
+        if hasattr(self, 'hwnd'):
+            forget_window(self.hwnd)
+        if self._prewarm_exec:
+            # _cancel_prewarm made queued plans stale, so they return at once
+            self._prewarm_exec.shutdown(wait=False)
+        super().destroy()
 
     def toggle_visibility(self):
         """Hides or shows the image window."""
@@ -462,10 +881,5 @@ class ImageWindow(tk.Toplevel):
         else:
             self.deiconify()
     def get_current_chunk_size(self):
-        row = self.current_chunk_index // self.num_chunks_x
-        col = self.current_chunk_index % self.num_chunks_x
-        x1 = col * CHUNK_SIZE
-        y1 = row * CHUNK_SIZE
-        x2 = min(x1 + CHUNK_SIZE, self.original_width)
-        y2 = min(y1 + CHUNK_SIZE, self.original_height)
+        x1, y1, x2, y2 = self._chunk_bounds(self.current_chunk_index)
         return x2 - x1, y2 - y1
@@ -1,4 +1,7 @@
+import logging
+import os
 import sys
+import PIL
 from control_window import ControlWindow
 
 def main():
@@ -12,6 +15,11 @@ def main():
     Otherwise, the user can select an image from within the GUI via the
     new "Load Image" button.
     """
+    # Per-pixel drawing diagnostics are DEBUG; run with LOG_LEVEL=DEBUG to see them
+    logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO').upper(), format='%(message)s')
+    # Pillow-SIMD releases carry a .postN suffix on the Pillow version they track
+    simd = " (Pillow-SIMD)" if ".post" in PIL.__version__ else ""
+    logging.getLogger(__name__).debug("Using Pillow %s%s", PIL.__version__, simd)
     original_image_path = sys.argv[1] if len(sys.argv) >= 2 else None
     app = ControlWindow(original_image_path=original_image_path)
     app.mainloop()
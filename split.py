@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
 import os
 import sys
@@ -22,32 +23,51 @@ def split_image(input_path, output_dir, chunk_size=32):
     num_chunks_x = (width + chunk_size - 1) // chunk_size
     num_chunks_y = (height + chunk_size - 1) // chunk_size
 
-    for i in range(num_chunks_y):
-        for j in range(num_chunks_x):
-            # Calculate crop box
-            left = j * chunk_size
-            upper = i * chunk_size
-            right = min(left + chunk_size, width)
-            lower = min(upper + chunk_size, height)
-
-            # Crop the chunk
-            chunk = img.crop((left, upper, right, lower))
-
-            # If the chunk is smaller than chunk_size, pad it
-            if chunk.width < chunk_size or chunk.height < chunk_size:
-                padded_chunk = Image.new(
-                    img.mode,
-                    (chunk_size, chunk_size),
-                    (0, 0, 0, 0) if img.mode == 'RGBA' else (0, 0, 0)
-                )
-                padded_chunk.paste(chunk, (0, 0))
-                chunk = padded_chunk
-
-            # Save the chunk
-            chunk_filename = f"chunk_{i}_{j}.png"
-            chunk_path = os.path.join(output_dir, chunk_filename)
-            chunk.save(chunk_path)
-            print(f"Saved chunk: {chunk_path}")
+    # Pad the whole image once to a whole number of chunks, so every tile is
+    # a plain full-size crop; for an exact fit this just decodes the image
+    padded_size = (num_chunks_x * chunk_size, num_chunks_y * chunk_size)
+    if img.size != padded_size:
+        padded_img = Image.new(
+            img.mode,
+            padded_size,
+            (0, 0, 0, 0) if img.mode == 'RGBA' else (0, 0, 0)
+        )
+        if img.mode == 'P':
+            # Keep the source palette so the unpadded pixels keep their colors
+            padded_img.putpalette(img.getpalette())
+        padded_img.paste(img, (0, 0))
+        img = padded_img
+    else:
+        img.load()
+
+    # The crops are cheap copies; PNG encoding (which releases the GIL) runs on
+    # the worker threads
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = []
+        for i in range(num_chunks_y):
+            for j in range(num_chunks_x):
+                # Calculate crop box
+                left = j * chunk_size
+                upper = i * chunk_size
+                right = left + chunk_size
+                lower = upper + chunk_size
+
+                # Crop the chunk
+                chunk = img.crop((left, upper, right, lower))
+                futures.append(executor.submit(_save_chunk, chunk, i, j, output_dir))
+
+        # Surface the first failed save, if any
+        for future in futures:
+            future.result()
+
+def _save_chunk(chunk, i, j, output_dir):
+    """Saves a cropped chunk as a PNG."""
+    # Save the chunk; the tiles are tiny, so the fastest zlib level costs
+    # little in size and avoids most of the encode time
+    chunk_filename = f"chunk_{i}_{j}.png"
+    chunk_path = os.path.join(output_dir, chunk_filename)
+    chunk.save(chunk_path, optimize=False, compress_level=1)
+    print(f"Saved chunk: {chunk_path}")
 
 if __name__ == "__main__":
     if len(sys.argv) < 3:
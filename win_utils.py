@@ -3,28 +3,56 @@ import win32con
 import win32gui
 import time
 import ctypes
-from config import KEY_POLL_INTERVAL, CALIBRATION_SLEEP, MIN_ALPHA, MAX_ALPHA, HOTKEY_METHOD_MAP
+import logging
+import threading
+from ctypes import wintypes
+from functools import lru_cache
+from config import MIN_ALPHA, MAX_ALPHA, HOTKEY_METHOD_MAP
+
+logger = logging.getLogger(__name__)
  
+# Extended style and 0-255 alpha last applied to each window by set_clickthrough
+_window_state = {}
+
 def set_clickthrough(hwnd, alpha, enabled):
-    """Toggles the click-through property of a window using pywin32."""
+    """
+    Toggles the click-through property of a window using pywin32.
+
+    Only the calls whose value changed since the last call for `hwnd` are made,
+    so an opacity change is a single SetLayeredWindowAttributes.
+    """
     try:
         # Clamp alpha to safe range
         alpha = max(MIN_ALPHA, min(MAX_ALPHA, alpha))
-        styles = win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE)
-        styles |= win32con.WS_EX_LAYERED  # Always set layered
-
-        if enabled:
-            styles |= win32con.WS_EX_TRANSPARENT
-        else:
-            styles &= ~win32con.WS_EX_TRANSPARENT
-
-        win32gui.SetWindowLong(hwnd, win32con.GWL_EXSTYLE, styles)
         # Convert alpha to 0-255, clamp to at least 26 (0.1*255)
         win32_alpha = max(26, min(255, int(alpha * 255)))
-        win32gui.SetLayeredWindowAttributes(hwnd, 0, win32_alpha, win32con.LWA_ALPHA)
+        last_styles, last_alpha = _window_state.get(hwnd, (None, None))
+
+        if last_styles is None or bool(last_styles & win32con.WS_EX_TRANSPARENT) != bool(enabled):
+            styles = win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE)
+            styles |= win32con.WS_EX_LAYERED  # Always set layered
+
+            if enabled:
+                styles |= win32con.WS_EX_TRANSPARENT
+            else:
+                styles &= ~win32con.WS_EX_TRANSPARENT
+
+            win32gui.SetWindowLong(hwnd, win32con.GWL_EXSTYLE, styles)
+            last_styles = styles
+
+        if win32_alpha != last_alpha:
+            win32gui.SetLayeredWindowAttributes(hwnd, 0, win32_alpha, win32con.LWA_ALPHA)
+        _window_state[hwnd] = (last_styles, win32_alpha)
     except Exception as e:
+        # State unknown after a failure; the next call rewrites everything
+        _window_state.pop(hwnd, None)
         print(f"Error setting clickthrough/alpha: {e}")
 
+def forget_window(hwnd):
+    """Drops the state set_clickthrough cached for a window that is going away."""
+    _window_state.pop(hwnd, None)
+
+@lru_cache(maxsize=256)
 def get_vk_code(key_str):
     """Converts a key string (like 'Insert', 'A') to a virtual key code."""
     if not key_str:
@@ -54,47 +82,153 @@ def get_vk_code(key_str):
         return None
     return result & 0xff # Return the low byte
 
+# Low-level keyboard hook plumbing for poll_global_keys
+_user32 = ctypes.windll.user32
+_LowLevelKeyboardProc = ctypes.WINFUNCTYPE(ctypes.c_ssize_t, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
+_user32.SetWindowsHookExW.argtypes = (ctypes.c_int, _LowLevelKeyboardProc, wintypes.HINSTANCE, wintypes.DWORD)
+_user32.SetWindowsHookExW.restype = wintypes.HHOOK
+_user32.CallNextHookEx.argtypes = (wintypes.HHOOK, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
+_user32.CallNextHookEx.restype = ctypes.c_ssize_t
+_user32.UnhookWindowsHookEx.argtypes = (wintypes.HHOOK,)
+
+class _KBDLLHOOKSTRUCT(ctypes.Structure):
+    _fields_ = [
+        ('vkCode', wintypes.DWORD),
+        ('scanCode', wintypes.DWORD),
+        ('flags', wintypes.DWORD),
+        ('time', wintypes.DWORD),
+        ('dwExtraInfo', ctypes.c_size_t),
+    ]
+
+_KEY_DOWN_MESSAGES = (win32con.WM_KEYDOWN, win32con.WM_SYSKEYDOWN)
+_KEY_UP_MESSAGES = (win32con.WM_KEYUP, win32con.WM_SYSKEYUP)
+
+def _build_hotkey_lookup(app_instance):
+    """Maps each virtual key code to its {needs_ctrl: bound_method} bindings."""
+    lookup = {}
+    for action, method_name in HOTKEY_METHOD_MAP:
+        key_str = app_instance.hotkey_map.get(action)
+        method_to_call = getattr(app_instance, method_name, None)
+        if not key_str or not method_to_call:
+            continue
+        needs_ctrl = key_str.startswith('Ctrl+')
+        if needs_ctrl:
+            key_str = key_str[5:]  # Remove 'Ctrl+' prefix
+        vk_code = get_vk_code(key_str)
+        if vk_code:
+            lookup.setdefault(vk_code, {}).setdefault(needs_ctrl, method_to_call)
+    return lookup
+
 def poll_global_keys(app_instance):
     """
-    Polls for global key presses using GetAsyncKeyState in a background thread.
-    Uses dynamic hotkey polling based on the app_instance's hotkey_map.
+    Listens for global key presses with a low-level keyboard hook in a background thread.
+    The thread sleeps in GetMessageW until a key event arrives, and keys are passed
+    on to other applications untouched. Uses the app_instance's hotkey_map and
+    puts the bound hotkey methods on its hotkey_queue.
+    Stop it with stop_global_key_polling().
     """
-    key_states = {}
- 
-    def is_key_pressed(vk_code):
-        state = ctypes.windll.user32.GetAsyncKeyState(vk_code)
-        is_down = state & 0x8000
-        if is_down and not key_states.get(vk_code):
-            key_states[vk_code] = True
-            return True
-        elif not is_down:
-            key_states[vk_code] = False
-        return False
-
-    while not app_instance.stop_polling:
-        # Check if we're calibrating - if so, skip global key handling
-        if hasattr(app_instance, 'is_calibrating') and app_instance.is_calibrating:
-            time.sleep(CALIBRATION_SLEEP) # Sleep to avoid busy-waiting
-            continue
+    pressed = set()  # Keys currently held, so auto-repeat doesn't re-fire
+    cache = {'map': None, 'lookup': {}}
 
-        # Check for Ctrl modifier state
-        is_ctrl_down = win32api.GetAsyncKeyState(win32con.VK_CONTROL) & 0x8000
-
-        # Dynamic hotkey polling - iterate through hotkey_map
-        for action, key_str in app_instance.hotkey_map.items():
-            # Handle special cases for Ctrl+ combinations
-            if key_str.startswith('Ctrl+'):
-                if not is_ctrl_down:
-                    continue
-                key_str = key_str[5:]  # Remove 'Ctrl+' prefix
-            
-            vk_code = get_vk_code(key_str)
-            if vk_code and is_key_pressed(vk_code):
-                # Get the corresponding method name
-                method_name = HOTKEY_METHOD_MAP.get(action)
-                if method_name:
-                    method_to_call = getattr(app_instance, method_name, None)
-                    if method_to_call:
-                        app_instance.root.after_idle(method_to_call)
- 
-        time.sleep(KEY_POLL_INTERVAL)
\ No newline at end of file
+    def dispatch(vk_code):
+        # Rebuild the key lookup only when the hotkey map has been rebound
+        snapshot = tuple(app_instance.hotkey_map.items())
+        if snapshot != cache['map']:
+            cache['map'] = snapshot
+            cache['lookup'] = _build_hotkey_lookup(app_instance)
+
+        bindings = cache['lookup'].get(vk_code)
+        if not bindings:
+            return
+        is_ctrl_down = bool(win32api.GetAsyncKeyState(win32con.VK_CONTROL) & 0x8000)
+        method_to_call = bindings.get(is_ctrl_down) or bindings.get(False)
+        if method_to_call:
+            # Tk isn't thread-safe; the app drains this queue on its own thread
+            app_instance.hotkey_queue.put(method_to_call)
+
+    def hook_proc(n_code, w_param, l_param):
+        try:
+            if n_code >= 0:
+                vk_code = ctypes.cast(l_param, ctypes.POINTER(_KBDLLHOOKSTRUCT)).contents.vkCode
+                if w_param in _KEY_DOWN_MESSAGES:
+                    # Skip global key handling while calibrating
+                    if vk_code not in pressed and not getattr(app_instance, 'is_calibrating', False):
+                        dispatch(vk_code)
+                    pressed.add(vk_code)
+                elif w_param in _KEY_UP_MESSAGES:
+                    pressed.discard(vk_code)
+        except Exception as e:
+            logger.error("Error handling global key: %s", e)
+        return _user32.CallNextHookEx(None, n_code, w_param, l_param)
+
+    # stop_global_key_polling posts WM_QUIT to this id (Thread.native_id needs Python 3.8)
+    threading.current_thread().win32_thread_id = win32api.GetCurrentThreadId()
+    callback = _LowLevelKeyboardProc(hook_proc)  # Must stay referenced while hooked
+    hook = _user32.SetWindowsHookExW(win32con.WH_KEYBOARD_LL, callback, win32api.GetModuleHandle(None), 0)
+    if not hook:
+        # Without the hook no global hotkey works, so this is an error, not a trace
+        logger.error("Error installing keyboard hook, global hotkeys are disabled: %s", ctypes.WinError())
+        return
+
+    try:
+        # The hook is called from inside GetMessageW; it returns 0 on WM_QUIT
+        msg = wintypes.MSG()
+        while not app_instance.stop_polling and _user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+            pass
+    finally:
+        _user32.UnhookWindowsHookEx(hook)
+
+def stop_global_key_polling(thread):
+    """Wakes a poll_global_keys thread out of GetMessageW so it can exit."""
+    thread_id = getattr(thread, 'win32_thread_id', None)
+    if thread_id is not None:
+        _user32.PostThreadMessageW(thread_id, win32con.WM_QUIT, 0, 0)
+
+# SendInput plumbing for the automated drawing strokes
+_INPUT_MOUSE = 0
+
+class _MOUSEINPUT(ctypes.Structure):
+    _fields_ = [
+        ('dx', wintypes.LONG),
+        ('dy', wintypes.LONG),
+        ('mouseData', wintypes.DWORD),
+        ('dwFlags', wintypes.DWORD),
+        ('time', wintypes.DWORD),
+        ('dwExtraInfo', ctypes.c_size_t),
+    ]
+
+class _INPUT(ctypes.Structure):
+    # MOUSEINPUT is the largest member of the INPUT union, so it alone sets the size
+    _fields_ = [('type', wintypes.DWORD), ('mi', _MOUSEINPUT)]
+
+def _send_mouse_buttons(*flags):
+    """Sends one left-button event per MOUSEEVENTF_* flag in a single SendInput call."""
+    inputs = (_INPUT * len(flags))(*(_INPUT(_INPUT_MOUSE, _MOUSEINPUT(0, 0, 0, f, 0, 0)) for f in flags))
+    _user32.SendInput(len(flags), inputs, ctypes.sizeof(_INPUT))
+
+def draw_stroke(points, hold=0.05, click_first=False, step_delay=0.002):
+    """
+    Draws a run of pixels the way the drawing loop expects: moves to the first
+    point, optionally clicks, then holds the left button while passing through
+    the remaining points and 1 pixel down from the last one before releasing.
+    A single point gives the original one-pixel drag. Uses SetCursorPos and
+    SendInput directly instead of pyautogui's tweening.
+
+    Windows merges back-to-back cursor moves into one WM_MOUSEMOVE, so each
+    point is held for `step_delay` seconds before the next move; otherwise an
+    app that paints one pixel per move event would only see the run's ends.
+    """
+    x, y = points[0]
+    _user32.SetCursorPos(x, y)
+    if click_first:
+        # Perform a standard click first (to select the tool/color)
+        _send_mouse_buttons(win32con.MOUSEEVENTF_LEFTDOWN, win32con.MOUSEEVENTF_LEFTUP)
+    _send_mouse_buttons(win32con.MOUSEEVENTF_LEFTDOWN)
+    if hold > 0:
+        time.sleep(hold)  # Let the target app register the press as a drag
+    for x, y in points[1:]:
+        _user32.SetCursorPos(x, y)
+        if step_delay > 0:
+            time.sleep(step_delay)
+    _user32.SetCursorPos(x, y + 1)
+    _send_mouse_buttons(win32con.MOUSEEVENTF_LEFTUP)